@@ -0,0 +1,71 @@
+import random
+
+
+class Agent:
+    """
+    Decides actions for one seat. act() receives the observation built by
+    Game.observation and the list of valid actions, and returns either an
+    action string or an (action, raise_to) tuple.
+    """
+
+    def act(self, observation: dict, valid_actions: list) -> str | tuple[str, int | None]:
+        raise NotImplementedError
+
+    def seed(self, seed) -> None:
+        pass
+
+
+class ConsoleAgent(Agent):
+    """Asks a human at the terminal, as the original betting loop did."""
+
+    def act(self, observation: dict, valid_actions: list) -> tuple[str, int | None]:
+        while True:
+            action = input(f"\n{observation['name']}'s turn. Chips: {observation['chips']}, To call: {observation['to_call']}\nValid actions: {', '.join(valid_actions)}\nChoose action: ").strip().lower()
+            if action not in valid_actions:
+                print("Invalid action, try again.")
+                continue
+            if action != "raise":
+                return action, None
+
+            while True:
+                try:
+                    raise_to = int(input("Enter total bet amount: ").strip())
+                except ValueError:
+                    print("Invalid amount. Please enter a valid integer.")
+                    continue
+
+                if raise_to < observation['min_raise_to']:
+                    print("Raise amount too low.")
+                    continue
+
+                if raise_to > observation['max_raise_to']:
+                    print("Not enough chips to raise that amount.")
+                    continue
+
+                return action, raise_to
+
+
+class CallingAgent(Agent):
+    """Checks when it can and calls otherwise, never raising or folding."""
+
+    def act(self, observation: dict, valid_actions: list) -> str:
+        for action in ("check", "call", "all-in"):
+            if action in valid_actions:
+                return action
+        return "fold"
+
+
+class RandomAgent(Agent):
+    """Picks uniformly among the valid actions, raising to a uniform amount."""
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def seed(self, seed) -> None:
+        self.rng.seed(seed)
+
+    def act(self, observation: dict, valid_actions: list) -> tuple[str, int | None]:
+        action = self.rng.choice(valid_actions)
+        if action == "raise":
+            return action, self.rng.randint(observation['min_raise_to'], observation['max_raise_to'])
+        return action, None
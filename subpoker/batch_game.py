@@ -0,0 +1,320 @@
+import time
+from collections import deque
+
+import numpy as np
+
+from .agent import Agent
+from .card import Card
+from .deck import Deck
+from .game import Game
+from .hand_evaluator import evaluate_indices
+from .player import Player
+from .simulation import SimulationResult
+
+FOLD, CHECK, CALL, RAISE, ALL_IN = range(5)
+ACTION_NAMES = ["fold", "check", "call", "raise", "all-in"]
+
+PREFLOP, FLOP, TURN, RIVER = range(4)
+
+SEAT_DTYPE = np.dtype([
+    ("chips", np.int64),
+    ("bet", np.int64),  # chips committed this hand, like Player.bet
+    ("folded", np.bool_),
+    ("all_in", np.bool_),
+    ("hand", np.int8, (2,)),  # card indices
+])
+TABLE_DTYPE = np.dtype([
+    ("board", np.int8, (5,)),
+    ("pot", np.int64),
+    ("current_bet", np.int64),
+    ("dealer", np.int16),
+])
+
+NO_SCORE = 10 ** 4  # worse than any hand
+
+
+def valid_action_mask(chips, to_call):
+    """Vectorized Game.valid_actions: an (M, 5) bool mask over the action codes."""
+    mask = np.zeros((len(chips), 5), dtype=bool)
+    has_chips = chips > 0
+    free = to_call == 0
+    mask[:, FOLD] = True
+    mask[:, CHECK] = has_chips & free
+    mask[:, CALL] = has_chips & ~free & (chips >= to_call)
+    mask[:, RAISE] = has_chips & (free | (chips > to_call))
+    mask[:, ALL_IN] = has_chips & (free | (chips != to_call))
+    return mask
+
+
+def random_policy(game, tables, seats, valid):
+    """Uniform over the valid actions and raise sizes, like RandomAgent."""
+    pick = (game.rng.random(len(tables)) * valid.sum(axis=1)).astype(np.int64)
+    codes = (valid.cumsum(axis=1) <= pick[:, None]).sum(axis=1)
+
+    low = game.tables["current_bet"][tables] + 1
+    high = game.seats["bet"][tables, seats] + game.seats["chips"][tables, seats]
+    raise_to = game.rng.integers(low, np.maximum(high, low) + 1)
+    return codes, raise_to
+
+
+def calling_policy(game, tables, seats, valid):
+    """Check, else call, else all-in, like CallingAgent."""
+    codes = np.full(len(tables), FOLD)
+    for code in (ALL_IN, CALL, CHECK):
+        codes = np.where(valid[:, code], code, codes)
+    return codes, np.zeros(len(tables), dtype=np.int64)
+
+
+class BatchGame:
+    """
+    Plays the same game as Game on n_tables tables at once, one decision per
+    table per step, with every seat's state held in structured arrays.
+
+    Like simulate(), every hand starts from starting_chips. A policy is a
+    function (game, tables, seats, valid_mask) -> (action codes, raise_to).
+    """
+
+    def __init__(self, n_tables: int, n_players: int, starting_chips: int = 1000, small_blind: int = 5,
+                 policy=random_policy, seed=None, record: bool = False):
+        if n_players < 2:
+            raise ValueError("At least 2 players are needed to start a game.")
+        if 2 * n_players + 8 > 52:
+            raise ValueError("Not enough cards for that many players.")
+        self.n_tables = n_tables
+        self.n_players = n_players
+        self.starting_chips = starting_chips
+        self.small_blind = small_blind
+        self.big_blind = 2 * small_blind
+        self.policy = policy
+        self.rng = np.random.default_rng(seed)
+
+        self.seats = np.zeros((n_tables, n_players), dtype=SEAT_DTYPE)
+        self.tables = np.zeros(n_tables, dtype=TABLE_DTYPE)
+        self.tables["dealer"] = -1
+        self.net = np.zeros((n_tables, n_players), dtype=np.int64)
+        self.hands_played = 0
+
+        self.record = record
+        self.history = []  # per hand: deck orders, actions per table, chips after the hand
+
+    def run(self, n_hands: int) -> SimulationResult:
+        start = time.perf_counter()
+        for _ in range(n_hands):
+            self.play_hand()
+        elapsed = time.perf_counter() - start
+
+        totals = self.net.sum(axis=0)
+        net = {f"Player {i + 1}": int(totals[i]) for i in range(self.n_players)}
+        return SimulationResult(n_hands * self.n_tables, elapsed, net)
+
+    def play_hand(self) -> None:
+        n, p = self.n_tables, self.n_players
+        seats, tables = self.seats, self.tables
+        seats["chips"] = self.starting_chips
+        seats["bet"] = 0
+        seats["folded"] = False
+        seats["all_in"] = False
+        tables["pot"] = 0
+        tables["dealer"] = (tables["dealer"] + 1) % p
+
+        # Deal exactly like Table: two cards per seat in seat order, then burn and turn
+        decks = self.rng.permuted(np.tile(np.arange(52, dtype=np.int8), (n, 1)), axis=1)
+        seats["hand"] = decks[:, :2 * p].reshape(n, p, 2)
+        tables["board"] = decks[:, [2 * p + 1, 2 * p + 2, 2 * p + 3, 2 * p + 5, 2 * p + 7]]
+        actions = [[] for _ in range(n)] if self.record else None
+
+        self._post_blinds()
+        for street in (PREFLOP, FLOP, TURN, RIVER):
+            self._betting_round(street, actions)
+        self._settle()
+
+        self.net += seats["chips"] - self.starting_chips
+        self.hands_played += 1
+        if self.record:
+            self.history.append({"decks": decks.copy(), "actions": actions, "chips": seats["chips"].copy()})
+
+    def _post_blinds(self) -> None:
+        rows = np.arange(self.n_tables)
+        dealer = self.tables["dealer"]
+        for offset, blind in ((1, self.small_blind), (2, self.big_blind)):
+            seat = (dealer + offset) % self.n_players
+            chips = self.seats["chips"][rows, seat]
+            amount = np.minimum(chips, blind)
+            self.seats["chips"][rows, seat] = chips - amount
+            self.seats["bet"][rows, seat] += amount
+            self.seats["all_in"][rows, seat] = chips == amount
+            self.tables["pot"] += amount
+        self.tables["current_bet"] = self.seats["bet"].max(axis=1)
+
+    def _betting_round(self, street: int, actions) -> None:
+        p = self.n_players
+        folded, all_in, bet = self.seats["folded"], self.seats["all_in"], self.seats["bet"]
+        current_bet = self.tables["current_bet"]
+        dealer = self.tables["dealer"].astype(np.int64)
+
+        active = ~folded & ~all_in
+        n_active = active.sum(axis=1)
+        lone_bet = np.where(active, bet, -1).max(axis=1)
+        skip = ((~folded).sum(axis=1) <= 1) | (n_active == 0) | ((n_active == 1) & (lone_bet >= current_bet))
+        to_act = active & ~skip[:, None]
+
+        if street == PREFLOP:
+            cursor = (dealer + 3) % p  # left of the big blind
+        elif p == 2:
+            cursor = dealer % p  # heads-up the big blind is the dealer and acts first after the flop
+        else:
+            cursor = (dealer + 1) % p
+        ring = np.arange(p)
+
+        while True:
+            tables = np.flatnonzero(to_act.any(axis=1) & ((~folded).sum(axis=1) > 1))
+            if len(tables) == 0:
+                break
+            order = (cursor[tables, None] + ring) % p
+            seats = order[np.arange(len(tables)), to_act[tables[:, None], order].argmax(axis=1)]
+            cursor[tables] = (seats + 1) % p
+            to_act[tables, seats] = False
+
+            # Nobody left to bet against: the seat is passed over without a decision
+            alone = (~folded[tables] & ~all_in[tables]).sum(axis=1) == 1
+            decide = ~((bet[tables, seats] >= current_bet[tables]) & alone)
+            if decide.any():
+                self._act(tables[decide], seats[decide], to_act, actions)
+
+    def _act(self, tables, seats, to_act, actions) -> None:
+        chips, bet = self.seats["chips"], self.seats["bet"]
+        folded, all_in = self.seats["folded"], self.seats["all_in"]
+        current_bet, pot = self.tables["current_bet"], self.tables["pot"]
+
+        stack = chips[tables, seats]
+        committed = bet[tables, seats]
+        to_call = current_bet[tables] - committed
+        valid = valid_action_mask(stack, to_call)
+        codes, raise_to = self.policy(self, tables, seats, valid)
+        codes = np.asarray(codes)
+        raise_to = np.asarray(raise_to)
+
+        # Invalid decisions fold, as Game does once an agent runs out of attempts
+        rows = np.arange(len(tables))
+        bad_raise = (codes == RAISE) & ((raise_to <= current_bet[tables]) | (raise_to - committed > stack))
+        codes = np.where(valid[rows, codes] & ~bad_raise, codes, FOLD)
+
+        amount = np.zeros(len(tables), dtype=np.int64)
+        amount = np.where(codes == CALL, to_call, amount)
+        amount = np.where(codes == RAISE, raise_to - committed, amount)
+        amount = np.where(codes == ALL_IN, stack, amount)
+
+        chips[tables, seats] = stack - amount
+        bet[tables, seats] = committed + amount
+        np.add.at(pot, tables, amount)
+        folded[tables, seats] = codes == FOLD
+        all_in[tables, seats] = (stack == amount) & (amount > 0)
+
+        raised = bet[tables, seats] > current_bet[tables]
+        current_bet[tables] = np.maximum(current_bet[tables], bet[tables, seats])
+        for table, seat in zip(tables[raised], seats[raised]):
+            to_act[table] = ~folded[table] & ~all_in[table]
+            to_act[table, seat] = False
+
+        if actions is not None:
+            for table, seat, code, target in zip(tables, seats, codes, raise_to):
+                actions[table].append((int(seat), ACTION_NAMES[code], int(target) if code == RAISE else None))
+
+    def _settle(self) -> None:
+        """Pays out every pot; a hand won by folds is a showdown with one eligible seat."""
+        n, p = self.n_tables, self.n_players
+        seats, tables = self.seats, self.tables
+        folded, committed = seats["folded"], seats["bet"]
+        rows = np.arange(n)
+
+        cards = np.concatenate([seats["hand"], np.repeat(tables["board"][:, None, :], p, axis=1)], axis=2)
+        scores = evaluate_indices(cards.reshape(n * p, 7)).reshape(n, p).astype(np.int64)
+        scores[folded] = NO_SCORE
+
+        # Layer the pot by contribution level, highest first. A layer no live
+        # seat reached (chips of players who folded) rolls down to the next one.
+        levels = np.sort(committed, axis=1)
+        winnings = np.zeros((n, p), dtype=np.int64)
+        carry = np.zeros(n, dtype=np.int64)
+        for k in range(p - 1, -1, -1):
+            level = levels[:, k]
+            below = levels[:, k - 1] if k else np.zeros(n, dtype=np.int64)
+            layer = carry + (np.minimum(committed, level[:, None]) - np.minimum(committed, below[:, None])).sum(axis=1)
+            eligible = ~folded & (committed >= level[:, None])
+            award = eligible.any(axis=1) & (level > below)
+            carry = np.where(award, 0, layer)
+
+            best = np.where(eligible, scores, NO_SCORE).min(axis=1)
+            winners = eligible & (scores == best[:, None]) & award[:, None]
+            n_winners = np.maximum(winners.sum(axis=1), 1)
+            share = np.where(award, layer // n_winners, 0)
+            winnings += winners * share[:, None]
+            winnings[rows, winners.argmax(axis=1)] += np.where(award, layer - share * n_winners, 0)  # convention
+
+        seats["chips"] += winnings
+        tables["pot"] = 0
+
+
+class _FixedDeck(Deck):
+    """A Deck whose shuffle deals a predetermined order."""
+
+    def __init__(self):
+        super().__init__()
+        self.order = list(range(52))
+
+    def shuffle(self) -> "Deck":
+        self.cards = [Card.from_index(int(i)) for i in self.order]
+        return self
+
+
+class _ReplayAgent(Agent):
+    def __init__(self, seat: int):
+        self.seat = seat
+        self.actions = deque()
+
+    def act(self, observation: dict, valid_actions: list) -> tuple[str, int | None]:
+        if not self.actions:
+            raise RuntimeError(f"Seat {self.seat} was asked to act more often than in the batch run.")
+        return self.actions.popleft()
+
+
+def verify_against_game(n_tables: int = 200, n_players: int = 6, n_hands: int = 3, seed=0,
+                        starting_chips: int = 1000, small_blind: int = 5, policy=random_policy) -> list[tuple]:
+    """
+    Replays a recorded BatchGame run through Game.play_hand with the same
+    decks and decisions and returns the (table, hand) pairs whose final
+    chips disagree. An empty list means both engines agree.
+    """
+    batch = BatchGame(n_tables, n_players, starting_chips, small_blind, policy=policy, seed=seed, record=True)
+    batch.run(n_hands)
+
+    mismatches = []
+    for table in range(n_tables):
+        players = [Player(f"Player {i + 1}", starting_chips) for i in range(n_players)]
+        agents = [_ReplayAgent(i) for i in range(n_players)]
+        deck = _FixedDeck()
+        game = Game(players, small_blind, agents=agents, verbose=False)
+        game.table.deck = deck
+
+        for hand, record in enumerate(batch.history):
+            for player in players:
+                player.chips = starting_chips
+            if len(game.players) != len(players):
+                game.set_players(list(players))
+            game.game_over = False
+            deck.order = record["decks"][table]
+            for seat, action, raise_to in record["actions"][table]:
+                agents[seat].actions.append((action, raise_to))
+
+            try:
+                game.play_hand()
+                agreed = [player.chips for player in players] == record["chips"][table].tolist()
+                agreed = agreed and not any(agent.actions for agent in agents)
+            except (RuntimeError, ValueError):
+                agreed = False
+            if not agreed:
+                mismatches.append((table, hand))
+                for agent in agents:
+                    agent.actions.clear()
+
+    return mismatches
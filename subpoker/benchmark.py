@@ -0,0 +1,221 @@
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from .agent import RandomAgent
+from .card import Card
+from .deck import Deck
+from .hand_evaluator import cache, evaluate_cards, evaluate_hand
+from .player import Player
+from .pot import PotLedger
+from .simulation import simulate
+
+SEED = 1234
+
+
+def _best_time(run, repeat: int) -> float:
+    """Fastest of repeat runs, the least disturbed by whatever else the machine is doing."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_evaluator(n: int = 20000, repeat: int = 3) -> dict:
+    rng = random.Random(SEED)
+    deck = Card.all()
+    hands = [rng.sample(deck, 7) for _ in range(n)]
+    results = {
+        "evaluate_cards_per_s": n / _best_time(lambda: [evaluate_cards(hand) for hand in hands], repeat),
+    }
+
+    def cached():
+        cache.clear()
+        for hand in hands:
+            evaluate_hand(hand[:2], hand[2:])
+        for hand in hands:
+            evaluate_hand(hand[:2], hand[2:])
+    capacity = cache.capacity
+    cache.resize(max(capacity, n))
+    results["evaluate_hand_cached_per_s"] = 2 * n / _best_time(cached, repeat)
+    cache.resize(capacity)
+    cache.clear()
+
+    try:
+        import numpy as np
+        from .hand_evaluator import evaluate_indices
+    except ImportError:
+        return results
+    indices = np.array([[card.index for card in hand] for hand in hands])
+    evaluate_indices(indices[:10])  # builds the NumPy tables outside the timing
+    results["evaluate_indices_per_s"] = n / _best_time(lambda: evaluate_indices(indices), repeat)
+    return results
+
+
+def bench_deck(n: int = 20000, repeat: int = 3) -> dict:
+    deck = Deck(rng=random.Random(SEED))
+
+    def shuffles():
+        for _ in range(n):
+            deck.reset().shuffle().settle()
+
+    def deals():
+        # A 6-player hand: hole cards, then burn and board for each street
+        for _ in range(n):
+            deck.reset().shuffle()
+            for _ in range(6):
+                deck.deal(2)
+            for num in (3, 1, 1):
+                deck.deal(1)
+                deck.deal(num)
+
+    return {
+        "shuffles_per_s": n / _best_time(shuffles, repeat),
+        "hands_dealt_per_s": n / _best_time(deals, repeat),
+    }
+
+
+def bench_pot(n: int = 20000, repeat: int = 3) -> dict:
+    rng = random.Random(SEED)
+    players = [Player(f"Player {i + 1}", 1000) for i in range(6)]
+    actions = [(players[rng.randrange(6)], rng.randint(1, 200)) for _ in range(n)]
+    pot = PotLedger()
+
+    def adds():
+        pot.clear()
+        for player, amount in actions:
+            pot.add(player, amount)
+
+    def side_pots():
+        for _ in range(n // 10):
+            pot.side_pots(players)
+
+    adds()
+    return {
+        "pot_add_ns": _best_time(adds, repeat) / n * 1e9,
+        "side_pots_ns": _best_time(side_pots, repeat) / (n // 10) * 1e9,
+    }
+
+
+def bench_hands(n_hands: int = 2000, repeat: int = 3, sizes=(2, 6, 9)) -> dict:
+    results = {}
+    for size in sizes:
+        best = min(simulate(n_hands, [RandomAgent() for _ in range(size)], seed=SEED).elapsed
+                   for _ in range(repeat))
+        results[f"hands_per_s_{size}p"] = n_hands / best
+    return results
+
+
+def _import_time(module: str, repeat: int) -> float:
+    """Fastest wall time of a fresh interpreter importing module, minus a bare interpreter's."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+
+    def run(code):
+        return _best_time(lambda: subprocess.run([sys.executable, "-c", code], env=env, check=True), repeat)
+    return max(run(f"import {module}") - run("pass"), 0.0)
+
+
+def bench_startup(repeat: int = 5) -> dict:
+    return {"import_game_ms": _import_time("subpoker.game", repeat) * 1e3}
+
+
+# Startup budget for `import subpoker.game`, see check_startup
+STARTUP_BUDGET = 0.1
+
+
+def check_startup(budget: float = STARTUP_BUDGET, repeat: int = 5) -> tuple[bool, float]:
+    """
+    Whether importing subpoker.game in a fresh interpreter stays under
+    budget seconds, and the time measured. Workers that never evaluate a
+    hand should not pay for the evaluator tables.
+    """
+    elapsed = _import_time("subpoker.game", repeat)
+    return elapsed <= budget, elapsed
+
+
+# Metrics where lower is better, everything else is a rate
+LOWER_IS_BETTER = ("_ns", "_ms")
+
+
+def run_benchmarks(quick: bool = False) -> dict:
+    """Every benchmark with fixed seeds, as {"meta": ..., "results": {name: value}}."""
+    scale = 5 if quick else 1
+    results = {}
+    results.update(bench_evaluator(20000 // scale))
+    results.update(bench_deck(20000 // scale))
+    results.update(bench_pot(20000 // scale))
+    results.update(bench_hands(2000 // scale))
+    results.update(bench_startup(3 if quick else 5))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": SEED,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.10) -> list[tuple[str, float, float, float]]:
+    """
+    (name, baseline, current, relative change) for every metric that got
+    worse than the baseline by more than threshold (0.10 is 10 %).
+    """
+    regressions = []
+    for name, old in baseline["results"].items():
+        new = current["results"].get(name)
+        if new is None or not old:
+            continue
+        change = (new - old) / old
+        worse = change > threshold if name.endswith(LOWER_IS_BETTER) else change < -threshold
+        if worse:
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the subpoker benchmarks.")
+    parser.add_argument("--output", "-o", help="write the results to this JSON file")
+    parser.add_argument("--compare", "-c", help="baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 is 10%%")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads, noisier numbers")
+    parser.add_argument("--startup-budget", type=float, nargs="?", const=STARTUP_BUDGET,
+                        help="only check that `import subpoker.game` takes at most this many seconds")
+    options = parser.parse_args(argv)
+
+    if options.startup_budget is not None:
+        ok, elapsed = check_startup(options.startup_budget)
+        print(f"import subpoker.game: {elapsed * 1e3:.1f} ms (budget {options.startup_budget * 1e3:.0f} ms)")
+        return 0 if ok else 1
+
+    current = run_benchmarks(options.quick)
+    for name, value in current["results"].items():
+        print(f"{name:32} {value:14,.1f}")
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, options.threshold)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old:,.1f} -> {new:,.1f} ({change:+.1%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {options.threshold:.0%} against {options.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,60 @@
 class Card:
-    suits = ['♠', '♥', '♦', '♣']    
+    suits = ['♠', '♥', '♦', '♣']
     ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
 
-    def __init__(self,rank: str,suit: str):
-        self.rank=rank
-        self.suit=suit
+    __slots__ = ("rank", "suit", "rank_index", "suit_index", "index", "mask")
+
+    _interned = {}  # (rank, suit) -> Card, every card exists exactly once
+    _by_index = []  # 0-51 -> Card, same order as a fresh Deck
+
+    def __new__(cls, rank: str, suit: str):
+        try:
+            return cls._interned[(rank, suit)]
+        except KeyError:
+            pass
+        if rank not in cls.ranks or suit not in cls.suits:
+            raise ValueError(f"Invalid card: {rank}{suit}")
+
+        card = super().__new__(cls)
+        card.rank = rank
+        card.suit = suit
+        card.rank_index = cls.ranks.index(rank)
+        card.suit_index = cls.suits.index(suit)
+        card.index = card.suit_index * 13 + card.rank_index
+        card.mask = 1 << card.index
+        cls._interned[(rank, suit)] = card
+        return card
+
+    @classmethod
+    def from_index(cls, index: int) -> "Card":
+        return cls._by_index[index]
+
+    @classmethod
+    def all(cls) -> list["Card"]:
+        return list(cls._by_index)
 
     def __str__(self) -> str:
        return f"{self.rank}{self.suit}"
-    
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, Card):
             return False
-        return self.rank == other.rank and self.suit == other.suit
-    
+        return self is other
+
     def __hash__(self) -> int:
-        return hash((self.rank, self.suit))
\ No newline at end of file
+        return self.index
+
+    def __lt__(self, other: "Card") -> bool:
+        return self.index < other.index
+
+    def __reduce__(self):
+        return (Card, (self.rank, self.suit))
+
+    def __copy__(self) -> "Card":
+        return self
+
+    def __deepcopy__(self, memo) -> "Card":
+        return self
+
+
+Card._by_index = [Card(rank, suit) for suit in Card.suits for rank in Card.ranks]
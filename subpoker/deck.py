@@ -1,68 +1,153 @@
 from .card import Card
 import random
 
+FULL_MASK = (1 << 52) - 1
+
 class Deck:
-    def __init__(self):
-        self.cards = []
-        for suit in Card.suits:
-            for rank in Card.ranks:
-                self.cards.append(Card(rank, suit))
-    
+    # The deck is one array holding every card: positions before the cursor
+    # are out of the deck (dealt or removed), the rest is the deck in order.
+    # Reset and shuffle only record what the live part should look like; the
+    # work happens when cards are dealt or the order is looked at.
+    def __init__(self, rng=None):
+        self._cards = Card.all()
+        self._cursor = 0
+        self._mask = FULL_MASK # bitmask of the cards still in the deck
+        self._pending = None # None, "reset" (fresh order) or "shuffle" (random order)
+        self.rng = rng if rng is not None else random # anything with a random() method
+
+    @property
+    def cards(self) -> list[Card]:
+        self._settle()
+        return self._cards[self._cursor:]
+
+    @cards.setter
+    def cards(self, cards: list[Card]) -> None:
+        self._cards = list(cards)
+        self._cursor = 0
+        self._mask = 0
+        for card in self._cards:
+            self._mask |= card.mask
+        self._pending = None
+
     def __len__(self) -> int:
-        return len(self.cards)
+        if self._pending == "reset":
+            self._settle()
+        return len(self._cards) - self._cursor
 
     def __iter__(self): # allows for "for card in deck"
         return iter(self.cards)
-    
+
 
     def __getitem__(self,position: int) -> Card:
         return self.cards[position]
-    
+
     def __str__(self) -> str:
-        return f"({self.cards})"   
+        return f"({self.cards})"
 
     def __repr__(self) -> str:
-        return f"Deck with {len(self.cards)} cards: ({self.cards})"
+        return f"Deck with {len(self)} cards: ({self.cards})"
+
+    def _settle(self) -> None:
+        if self._pending == "reset":
+            self._cards = Card.all()
+        elif self._pending == "shuffle":
+            self._shuffle_range(self._cursor, len(self._cards))
+        self._pending = None
+
+    def _shuffle_range(self, start: int, stop: int) -> None:
+        # Fisher-Yates steps for positions start..stop-1, each drawing from the whole live part
+        cards = self._cards
+        end = len(cards)
+        rand = self.rng.random
+        for i in range(start, stop):
+            j = i + int(rand() * (end - i))
+            cards[i], cards[j] = cards[j], cards[i]
 
-    def shuffle(self) -> "Deck": 
-        random.shuffle(self.cards)
+    def shuffle(self) -> "Deck":
+        if self._pending == "reset" and len(self._cards) != 52:
+            # A shuffle makes any order of the 52 cards fine, but cards set
+            # through the cards setter have to be replaced by the full deck
+            self._cards = Card.all()
+        self._pending = "shuffle"
         return self
-    
+
     def sort(self) -> "Deck":
-        self.cards.sort()
+        self._settle()
+        self._cards[self._cursor:] = sorted(self._cards[self._cursor:])
         return self
 
     def reset(self) -> "Deck":
-        self.cards = []
-        for suit in Card.suits:
-            for rank in Card.ranks:
-                self.cards.append(Card(rank, suit))
+        self._cursor = 0
+        self._mask = FULL_MASK
+        self._pending = "reset"
         return self
 
     def deal(self, num: int) -> list[Card]:
-        if num > len(self.cards):
+        start = self._cursor
+        if num > len(self._cards) - start:
             raise ValueError("Not enough cards in the deck")
-        dealt_cards = self.cards[:num]
-        self.cards = self.cards[num:]
+        if self._pending == "shuffle":
+            self._shuffle_range(start, start + num) # only the dealt cards get shuffled
+        elif self._pending == "reset":
+            self._settle()
+        self._cursor = start + num
+        dealt_cards = self._cards[start:self._cursor]
+        for card in dealt_cards:
+            self._mask ^= card.mask
         return dealt_cards
-    
+
+    def settle(self) -> "Deck":
+        # Fixes the order of the live part now instead of at the next deal
+        self._settle()
+        return self
+
+    def snapshot(self) -> tuple:
+        """(order, cursor, mask). Settles a pending shuffle first so the order is fixed."""
+        self._settle()
+        return tuple(self._cards), self._cursor, self._mask
+
+    def restore(self, snapshot: tuple) -> None:
+        cards, self._cursor, self._mask = snapshot
+        self._cards = list(cards)
+        self._pending = None
+
+    def position(self) -> tuple[int, int]:
+        return self._cursor, self._mask
+
+    def rewind(self, cursor: int, mask: int) -> None:
+        # Puts the cards dealt since cursor back on top, in the same order.
+        # Only valid while nothing has reordered the deck in between.
+        self._cursor = cursor
+        self._mask = mask
+
     def add(self, cards: Card | list[Card]) -> None:
-        if isinstance(cards, list):
-            self.cards.extend(cards)
-        else:
-            self.cards.append(cards)
-    
+        if not isinstance(cards, list):
+            cards = [cards]
+        self._settle()
+        for card in cards:
+            if self._mask & card.mask:
+                continue # already in the deck
+            if card in self._cards[:self._cursor]:
+                self._cards.remove(card)
+                self._cursor -= 1
+            self._cards.append(card) # back at the bottom
+            self._mask |= card.mask
+
     def __contains__(self, card: Card) -> bool:
-        return card in self.cards
-    
+        return bool(self._mask & card.mask)
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, Deck):
             return False
-        return sorted(self.cards) == sorted(other.cards)
+        return self._mask == other._mask
 
     def remove(self, cards) -> None:
+        if self._pending == "reset":
+            self._settle()
         for card in cards:
-            if card in self.cards:
-                self.cards.remove(card)
-
-    
\ No newline at end of file
+            if self._mask & card.mask:
+                # Move it just before the cursor, keeping the order of the rest
+                self._cards.remove(card)
+                self._cards.insert(self._cursor, card)
+                self._cursor += 1
+                self._mask ^= card.mask
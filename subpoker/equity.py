@@ -0,0 +1,231 @@
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, permutations
+
+from .card import Card
+from .deck import Deck
+from .hand_evaluator import attach_tables, evaluate_many, share_tables
+
+# Samples are always drawn in chunks of this size, each from its own seeded
+# generator, so a given seed gives the same answer whatever the worker count.
+CHUNK_SIZE = 5000
+
+# equity() enumerates every runout instead of sampling when there are at most this many
+EXACT_THRESHOLD = 50000
+
+
+class EquityResult:
+    def __init__(self, samples: int, wins: int, ties: int, share: float, share_sq: float,
+                 exact: bool = False):
+        self.samples = samples  # number of runouts when exact
+        self.wins = wins
+        self.ties = ties
+        self.losses = samples - wins - ties
+        self.share = share  # pot share summed over samples (ties split the pot)
+        self.share_sq = share_sq
+        self.exact = exact
+
+    @property
+    def win(self) -> float:
+        return self.wins / self.samples
+
+    @property
+    def tie(self) -> float:
+        return self.ties / self.samples
+
+    @property
+    def loss(self) -> float:
+        return self.losses / self.samples
+
+    @property
+    def equity(self) -> float:
+        return self.share / self.samples
+
+    def confidence_interval(self, outcome: str = "equity", z: float = 1.96) -> tuple[float, float]:
+        """
+        Confidence interval for "win", "tie", "loss" (Wilson score interval)
+        or "equity" (normal approximation). Exact results have zero width.
+        """
+        n = self.samples
+        if self.exact:
+            value = self.equity if outcome == "equity" else getattr(self, outcome)
+            return value, value
+        if outcome == "equity":
+            mean = self.equity
+            variance = max(self.share_sq / n - mean * mean, 0.0)
+            half = z * math.sqrt(variance / n)
+            return max(mean - half, 0.0), min(mean + half, 1.0)
+        if outcome not in ("win", "tie", "loss"):
+            raise ValueError(f"Unknown outcome: {outcome}")
+
+        p = getattr(self, outcome)
+        denominator = 1 + z * z / n
+        centre = (p + z * z / (2 * n)) / denominator
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+        return max(centre - half, 0.0), min(centre + half, 1.0)
+
+    def __repr__(self) -> str:
+        low, high = self.confidence_interval()
+        return (f"EquityResult(win={self.win:.4f}, tie={self.tie:.4f}, loss={self.loss:.4f}, "
+                f"equity={self.equity:.4f} [{low:.4f}, {high:.4f}], samples={self.samples}, exact={self.exact})")
+
+
+def live_deck(hands: list, board: list, dead: list = ()) -> Deck:
+    """A Deck holding every card not already in a hand, on the board or dead."""
+    known = [card for hand in hands for card in hand] + list(board) + list(dead)
+    if len(set(known)) != len(known):
+        raise ValueError("The same card appears more than once.")
+    deck = Deck()
+    deck.remove(known)
+    return deck
+
+
+def _tally(hands: list, boards: list, weights: list | None = None) -> list[tuple]:
+    """
+    Wins, ties, pot share and squared share per hand over a list of full
+    boards, each board counting weights[i] times (once by default).
+    """
+    n = len(boards)
+    if weights is None:
+        weights = [1] * n
+    scores = [evaluate_many([hand] * n, boards) for hand in hands]
+    wins = [0] * len(hands)
+    ties = [0] * len(hands)
+    share = [0.0] * len(hands)
+    share_sq = [0.0] * len(hands)
+
+    for weight, row in zip(weights, zip(*scores)):
+        best = min(row)
+        winners = [i for i, score in enumerate(row) if score == best]
+        if len(winners) == 1:
+            wins[winners[0]] += weight
+            share[winners[0]] += weight
+            share_sq[winners[0]] += weight
+        else:
+            split = 1.0 / len(winners)
+            for i in winners:
+                ties[i] += weight
+                share[i] += weight * split
+                share_sq[i] += weight * split * split
+
+    return list(zip(wins, ties, share, share_sq))
+
+
+def _sample_chunk(hands: list, board: list, remaining: list, samples: int, seed: str) -> list[tuple]:
+    rng = random.Random(seed)
+    missing = 5 - len(board)
+    boards = [board + rng.sample(remaining, missing) for _ in range(samples)]
+    return _tally(hands, boards)
+
+
+def monte_carlo_equity(hands: list, board: list = (), samples: int = 20000, seed: int | None = None,
+                       workers: int = 1, dead: list = ()) -> list[EquityResult]:
+    """
+    Estimates each hand's win/tie/loss frequencies by sampling board runouts.
+
+    hands are known hole cards (e.g. Player.hand), board is the partial
+    Table.board and dead are other cards known to be out of the deck. With
+    workers > 1 the samples are split across a process pool.
+    """
+    hands = [list(hand) for hand in hands]
+    board = list(board)
+    if len(hands) < 2:
+        raise ValueError("At least 2 hands are needed to compute equity.")
+    if len(board) > 5:
+        raise ValueError("A board has at most 5 cards.")
+    if samples <= 0:
+        raise ValueError("The sample budget must be positive.")
+
+    remaining = list(live_deck(hands, board, dead))
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+
+    chunks = [(hands, board, remaining, min(CHUNK_SIZE, samples - start), f"{seed}:{i}")
+              for i, start in enumerate(range(0, samples, CHUNK_SIZE))]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=attach_tables,
+                                 initargs=(share_tables(),)) as pool:
+            partials = list(pool.map(_sample_chunk, *zip(*chunks)))
+    else:
+        partials = [_sample_chunk(*chunk) for chunk in chunks]
+
+    return _merge(partials, samples)
+
+
+def _suit_symmetries(known_sets: list) -> list[tuple]:
+    """
+    Suit permutations that map every known card set (each hand, the board,
+    the dead cards) onto itself. Runouts related by one of these are
+    equivalent, so only one of them needs scoring.
+    """
+    symmetries = []
+    for perm in permutations(range(4)):
+        if all({perm[i // 13] * 13 + i % 13 for i in cards} == cards for cards in known_sets):
+            symmetries.append(perm)
+    return symmetries
+
+
+def _canonical_runouts(remaining: list, missing: int, symmetries: list) -> dict:
+    """Maps each canonical runout (tuple of card indices) to the number of runouts it stands for."""
+    runouts = combinations(sorted(card.index for card in remaining), missing)
+    if len(symmetries) == 1:  # only the identity, nothing to collapse
+        return dict.fromkeys(runouts, 1)
+
+    maps = [[perm[i // 13] * 13 + i % 13 for i in range(52)] for perm in symmetries]
+    canonical_runouts = {}
+    for runout in runouts:
+        canonical = min(tuple(sorted([card_map[i] for i in runout])) for card_map in maps)
+        canonical_runouts[canonical] = canonical_runouts.get(canonical, 0) + 1
+    return canonical_runouts
+
+
+def exact_equity(hands: list, board: list = (), dead: list = ()) -> list[EquityResult]:
+    """
+    Enumerates every remaining runout without replacement, scoring each
+    suit-isomorphic class of runouts once with its multiplicity as weight.
+    """
+    hands = [list(hand) for hand in hands]
+    board = list(board)
+    if len(hands) < 2:
+        raise ValueError("At least 2 hands are needed to compute equity.")
+    if len(board) > 5:
+        raise ValueError("A board has at most 5 cards.")
+
+    remaining = list(live_deck(hands, board, dead))
+    known_sets = [{card.index for card in cards} for cards in hands + [board, list(dead)]]
+    runouts = _canonical_runouts(remaining, 5 - len(board), _suit_symmetries(known_sets))
+
+    boards = [board + [Card.from_index(i) for i in runout] for runout in runouts]
+    weights = list(runouts.values())
+    return _merge([_tally(hands, boards, weights)], sum(weights), exact=True)
+
+
+def _merge(partials: list, samples: int, exact: bool = False) -> list[EquityResult]:
+    results = []
+    for per_chunk in zip(*partials):  # one entry per hand
+        wins = sum(p[0] for p in per_chunk)
+        ties = sum(p[1] for p in per_chunk)
+        share = sum(p[2] for p in per_chunk)
+        share_sq = sum(p[3] for p in per_chunk)
+        results.append(EquityResult(samples, wins, ties, share, share_sq, exact))
+    return results
+
+
+def equity(hands: list, board: list = (), samples: int = 20000, seed: int | None = None,
+           workers: int = 1, dead: list = (), method: str = "auto",
+           exact_threshold: int = EXACT_THRESHOLD) -> list[EquityResult]:
+    """
+    Equity of each hand on a partial board. method is "exact", "monte_carlo"
+    or "auto", which enumerates when the number of runouts is at most
+    exact_threshold and samples otherwise.
+    """
+    if method == "auto":
+        unseen = 52 - sum(len(hand) for hand in hands) - len(board) - len(dead)
+        method = "exact" if math.comb(unseen, 5 - len(board)) <= exact_threshold else "monte_carlo"
+
+    if method == "exact":
+        return exact_equity(hands, board, dead=dead)
+    if method == "monte_carlo":
+        return monte_carlo_equity(hands, board, samples=samples, seed=seed, workers=workers, dead=dead)
+    raise ValueError(f"Unknown equity method: {method}")
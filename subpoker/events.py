@@ -0,0 +1,274 @@
+import sys
+
+
+class Event:
+    """Something that happened at a table. message() is the line the console shows, None for nothing."""
+
+    __slots__ = ()
+
+    def message(self) -> str | None:
+        return None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Message(Event):
+    """Free text, from Game.log."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def message(self) -> str:
+        return self.text
+
+
+class HandStarted(Event):
+    __slots__ = ("round", "players", "dealer")
+
+    def __init__(self, round: int, players: list, dealer):
+        self.round = round
+        self.players = players  # seated players, in seat order
+        self.dealer = dealer
+
+
+class BlindPosted(Event):
+    __slots__ = ("player", "blind", "amount", "all_in")
+
+    def __init__(self, player, blind: str, amount: int, all_in: bool):
+        self.player = player
+        self.blind = blind  # "small" or "big"
+        self.amount = amount
+        self.all_in = all_in
+
+    def message(self) -> str:
+        if self.all_in:
+            return f"{self.player.name} posts {self.blind} blind and is all-in for {self.amount} chips!"
+        return f"{self.player.name} posts {self.blind} blind of {self.amount} chips."
+
+
+class ActionTaken(Event):
+    """A processed action: amount is the chips it put in, current_bet the bet to match afterwards."""
+
+    __slots__ = ("player", "action", "amount", "current_bet", "raised", "state")
+
+    def __init__(self, player, action: str, amount: int, current_bet: int, raised: bool, state: str):
+        self.player = player
+        self.action = action
+        self.amount = amount
+        self.current_bet = current_bet
+        self.raised = raised  # whether it raised the bet, an all-in can
+        self.state = state
+
+    def message(self) -> str | None:
+        name = self.player.name
+        action = self.action
+        if action == "fold":
+            return f"{name} has folded."
+        if action == "check":
+            return f"{name} checks."
+        if action == "raise":
+            return f"{name} raises to {self.current_bet}."
+        if action == "all-in":
+            if self.raised:
+                return f"{name} goes all-in for {self.amount} and sets new bet of {self.current_bet}."
+            return f"{name} goes all-in for {self.amount}."
+        return None  # calls are not announced
+
+
+class BettingSkipped(Event):
+    __slots__ = ("state",)
+
+    def __init__(self, state: str):
+        self.state = state
+
+    def message(self) -> str:
+        return "Not enough players to continue betting."
+
+
+class DecisionRejected(Event):
+    """An agent's decision that could not be applied; it is asked again."""
+
+    __slots__ = ("player", "reason")
+
+    def __init__(self, player, reason: str):
+        self.player = player
+        self.reason = reason
+
+    def message(self) -> str:
+        return self.reason
+
+
+class ForcedFold(Event):
+    """A player folded for them, e.g. after too many invalid decisions or a timeout."""
+
+    __slots__ = ("player", "reason")
+
+    def __init__(self, player, reason: str):
+        self.player = player
+        self.reason = reason
+
+    def message(self) -> str:
+        return f"{self.player.name} {self.reason}."
+
+
+class ShowdownResult(Event):
+    """Scores (lower is better) of the players who showed down, and what each of them won."""
+
+    __slots__ = ("scores", "winnings")
+
+    def __init__(self, scores: dict, winnings: dict):
+        self.scores = scores
+        self.winnings = winnings
+
+
+class PotAwarded(Event):
+    __slots__ = ("player", "amount", "showdown")
+
+    def __init__(self, player, amount: int, showdown: bool):
+        self.player = player
+        self.amount = amount
+        self.showdown = showdown
+
+    def message(self) -> str:
+        if self.showdown:
+            return f"{self.player.name} wins {self.amount} chips."
+        return f"{self.player.name} wins the pot of {self.amount} chips as the last player standing."
+
+
+class PlayerEliminated(Event):
+    __slots__ = ("player",)
+
+    def __init__(self, player):
+        self.player = player
+
+    def message(self) -> str:
+        return f"{self.player.name} is out of chips and has been eliminated."
+
+
+class GameWon(Event):
+    __slots__ = ("player",)
+
+    def __init__(self, player):
+        self.player = player
+
+    def message(self) -> str:
+        return f"{self.player.name} wins the game!"
+
+
+class NullSink:
+    """
+    Discards everything. Game and Table treat it like having no sink at
+    all (see active_sink), so events are not even built.
+    """
+
+    def handle(self, event: Event) -> None:
+        pass
+
+
+class ConsoleSink:
+    """Prints each event's message, the output Game always had."""
+
+    def __init__(self, stream=None):
+        self.stream = stream  # None is whatever sys.stdout is at the time
+
+    def handle(self, event: Event) -> None:
+        message = event.message()
+        if message is not None:
+            print(message, file=self.stream)
+
+    def handle_many(self, events: list) -> None:
+        lines = [message for message in (event.message() for event in events) if message is not None]
+        if lines:
+            (self.stream or sys.stdout).write("\n".join(lines) + "\n")
+
+
+class BatchSink:
+    """
+    Buffers events and hands them to target in bulk, every capacity events
+    and on flush() / close(). target is a sink (its handle_many is used
+    when it has one) or a function taking a list of events.
+    """
+
+    def __init__(self, target, capacity: int = 1024):
+        self.capacity = capacity
+        self._buffer = []
+        if hasattr(target, "handle_many"):
+            target = target.handle_many
+        elif hasattr(target, "handle"):
+            handle = target.handle
+
+            def target(events):
+                for event in events:
+                    handle(event)
+        self._target = target
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def handle(self, event: Event) -> None:
+        buffer = self._buffer
+        buffer.append(event)
+        if len(buffer) >= self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            events = self._buffer
+            self._buffer = []
+            self._target(events)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventBus:
+    """
+    Fans events out to subscribers, each a sink (anything with handle) or a
+    function taking an event. A subscriber given event types only receives
+    those (and their subclasses). The bus is itself a sink, so it is what
+    gets passed to Game when there is more than one subscriber.
+    """
+
+    def __init__(self, *sinks):
+        self._subscribers = []  # (handler, event types or None for all)
+        self._routes = {}  # event type -> handlers, rebuilt after each (un)subscribe
+        for sink in sinks:
+            self.subscribe(sink)
+
+    def subscribe(self, sink, *kinds) -> None:
+        self._subscribers.append((getattr(sink, "handle", sink), kinds or None))
+        self._routes.clear()
+
+    def unsubscribe(self, sink) -> None:
+        handler = getattr(sink, "handle", sink)
+        self._subscribers = [entry for entry in self._subscribers if entry[0] != handler]
+        self._routes.clear()
+
+    def _route(self, kind: type) -> list:
+        handlers = [handler for handler, kinds in self._subscribers if kinds is None or issubclass(kind, kinds)]
+        self._routes[kind] = handlers
+        return handlers
+
+    def handle(self, event: Event) -> None:
+        handlers = self._routes.get(type(event))
+        if handlers is None:
+            handlers = self._route(type(event))
+        for handler in handlers:
+            handler(event)
+
+
+def active_sink(sink):
+    """sink, or None when it would drop every event anyway."""
+    if sink is None or isinstance(sink, NullSink):
+        return None
+    return sink
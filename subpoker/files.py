@@ -0,0 +1,18 @@
+import os
+
+
+def replace_file(path: str, write) -> None:
+    """
+    Writes path with write(file) through a temporary file that then replaces
+    it, so readers never see a half-written file and a crash mid-write leaves
+    the previous one. The temporary file is removed if anything fails.
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            write(file)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
@@ -1,27 +1,80 @@
+import time
+
 from .table import Table
 from .player import Player
-from typing import Optional
+from .agent import ConsoleAgent
+from .events import (ActionTaken, BettingSkipped, BlindPosted, ConsoleSink, DecisionRejected, ForcedFold, GameWon,
+                     HandStarted, Message, NullSink, PotAwarded, ShowdownResult, active_sink)
 from .hand_evaluator import evaluate_hand, get_hand_rank_string
+from .instrumentation import GameStats
+from .snapshot import GameSnapshot, ACTION, DEAL, PAYOUT, undo
 
 
 class Game:
-    def __init__(self, players: list, small_blind: int):
+    max_attempts = 3  # invalid decisions from an agent before its player is folded
+
+    def __init__(self, players: list, small_blind: int, agents=None, verbose: bool = True, rng=None, recorder=None,
+                 events=None):
         if len(players) < 2:
             raise ValueError("At least 2 players are needed to start a game.")
         for i,player in enumerate(players):
             player.id = i
+        if agents is None:
+            agents = [ConsoleAgent() for _ in players]
+        if isinstance(agents, dict):
+            agents = [agents[player] for player in players]
+        if len(agents) != len(players):
+            raise ValueError("Every player needs exactly one agent.")
         self.players = players
-        self.table = Table(players)
+        self.agents = dict(zip(players, agents))
+        if events is None and verbose:
+            events = ConsoleSink()
+        self.events = active_sink(events) # sink for the events.Event of each step, None when nobody listens
+        self.table = Table(players, rng=rng, events=self.events if self.events is not None else NullSink())
         self.small_blind = small_blind
         self.big_blind = 2 * small_blind
         self.dealer_position = -1
         self.round = 0
         self.state = "preflop"
         self.game_over = False
+        self.recorder = recorder # e.g. history.HandHistoryWriter
+        self.undo_log = None # what each step overwrote since checkpoint(), None when not logging
+        self.stats = None # GameStats while instrumentation is on, see enable_stats()
+
+    def log(self, message: str) -> None:
+        if self.events is not None:
+            self.events.handle(Message(message))
+
+    def set_events(self, sink) -> None:
+        """Sends this game's events to sink (e.g. an events.EventBus), None or a NullSink to drop them."""
+        self.events = self.table.events = active_sink(sink)
+
+    def enable_stats(self) -> GameStats:
+        """Starts timing the stages of each hand and counting calls, see GameStats."""
+        if self.stats is None:
+            self.stats = GameStats()
+        return self.stats
+
+    def disable_stats(self) -> None:
+        self.stats = None
+
+    def _stage(self, name: str, step) -> None:
+        if self.stats is None:
+            step()
+        else:
+            self.stats.time(name, step)
+
 
+    @property
+    def seats(self):
+        return self.table.seats
+
+    def set_players(self, players: list) -> None:
+        self.players = players
+        self.table.set_players(players)
 
     def get_active_nonfolded_players(self):
-        return [p for p in self.players if p.is_active and not p.folded]
+        return self.seats.players_in(self.seats.active)
 
 
     def rotate_blinds(self) -> None:
@@ -33,27 +86,29 @@ class Game:
         self.current_sb = self.players[sb_index]
         self.current_bb = self.players[bb_index]
 
+        events = self.events
+        if events is not None:
+            events.handle(HandStarted(self.round, self.players, self.players[self.dealer_position]))
+
         if self.current_sb.chips < self.small_blind:
-            print(f"{self.current_sb.name} posts small blind and is all-in for {self.current_sb.chips} chips!")
             amount = self.current_sb.chips
             self.current_sb.go_all_in()
         else:
-            print(f"{self.current_sb.name} posts small blind of {self.small_blind} chips.")
             amount = self.small_blind
             self.current_sb.bet_chips(amount)
-        eligible_players = set(self.get_active_nonfolded_players())  # Eligible players for pot
-        self.table.add_to_pot(amount, eligible_players=eligible_players)
+        if events is not None:
+            events.handle(BlindPosted(self.current_sb, "small", amount, amount < self.small_blind))
+        self.table.add_to_pot(self.current_sb, amount)
 
         if self.current_bb.chips < self.big_blind:
-            print(f"{self.current_bb.name} posts big blind and is all-in for {self.current_bb.chips} chips!")
             amount = self.current_bb.chips
             self.current_bb.go_all_in()
         else:
-            print(f"{self.current_bb.name} posts big blind of {self.big_blind} chips.")
             amount = self.big_blind
             self.current_bb.bet_chips(amount)
-        eligible_players = set(self.get_active_nonfolded_players())  # Eligible players for pot
-        self.table.add_to_pot(amount, eligible_players=eligible_players)
+        if events is not None:
+            events.handle(BlindPosted(self.current_bb, "big", amount, amount < self.big_blind))
+        self.table.add_to_pot(self.current_bb, amount)
 
         self.current_bet = max(self.current_sb.bet, self.current_bb.bet) # in case bb is all-in
 
@@ -88,45 +143,97 @@ class Game:
         print(f"Deck left: {len(self.table.deck)} cards")
 
 
+    def snapshot(self) -> GameSnapshot:
+        return GameSnapshot(self)
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        snapshot.restore(self)
+        self.undo_log = None
+
+    def checkpoint(self) -> int:
+        """
+        Starts logging what every action, deal and payout overwrites and
+        returns a mark to rollback() to; marks can be nested. Undoing costs
+        about as much as the steps undone. Marks only last until the next
+        hand starts, use snapshot() to go back further.
+        """
+        if self.undo_log is None:
+            self.undo_log = []
+            self.table.deck.settle() # rewinding a deal needs the order fixed
+        return len(self.undo_log)
+
+    def rollback(self, mark: int) -> None:
+        log = self.undo_log
+        if log is None or mark > len(log):
+            raise ValueError("No such checkpoint, a new hand may have started since.")
+        while len(log) > mark:
+            undo(self, log.pop())
+
+    def _log_deal(self) -> None:
+        self.undo_log.append((DEAL, self.state, len(self.table.board), *self.table.deck.position()))
+
+    def _log_payout(self) -> None:
+        pot = self.table.pot
+        self.undo_log.append((PAYOUT, self.state, [(p, p.chips) for p in self.players], pot.contributions, pot.total))
+
     def start_round(self) -> None:
+        self.undo_log = None
         self.reset()
-        self.rotate_blinds()
-        self.table.deal_private()
+        self._stage("blinds", self.rotate_blinds)
+        self._stage("deal", self.table.deal_private)
+        if self.recorder is not None:
+            self.recorder.start_hand(self)
 
     def deal_flop(self) -> None:
+        if self.undo_log is not None:
+            self._log_deal()
         self.state = "flop"
         self.table.deal_board(3)
+        if self.recorder is not None:
+            self.recorder.board(1, self.table.board[-3:])
 
     def deal_turn(self) -> None:
+        if self.undo_log is not None:
+            self._log_deal()
         self.state = "turn"
         self.table.deal_board(1)
+        if self.recorder is not None:
+            self.recorder.board(2, self.table.board[-1:])
 
     def deal_river(self) -> None:
+        if self.undo_log is not None:
+            self._log_deal()
         self.state = "river"
         self.table.deal_board(1)
+        if self.recorder is not None:
+            self.recorder.board(3, self.table.board[-1:])
     
     def only_one_player_left(self) -> bool:
-        return len([p for p in self.players if p.is_active and not p.folded]) == 1
+        # All-in players are still in the hand, only folding takes a player out
+        return self.seats.in_hand_count() == 1
 
 
     def award_last_player(self) -> None:
-        remaining_player = next(p for p in self.players if p.is_active and not p.folded)
+        if self.undo_log is not None:
+            self._log_payout()
+        remaining_player = self.seats.players[self.seats.next_seat(self.seats.in_hand, 0)]
         total_pot = self.table.total_pot()
         remaining_player.chips += total_pot
-        print(f"{remaining_player.name} wins the pot of {total_pot} chips as the last player standing.")
-        self.table.pots = []
+        if self.events is not None:
+            self.events.handle(PotAwarded(remaining_player, total_pot, showdown=False))
+        if self.recorder is not None:
+            self.recorder.end_hand({remaining_player: total_pot}, total_pot, showdown=False)
+        self.table.pot.clear()
+
+    def first_to_act(self) -> int:
+        if self.state == "preflop": # Order is different to rest of round
+            return (self.current_bb.seat + 1) % len(self.players) # heads-up that is the small blind
+        if len(self.players) == 2: # When only 2 players are left, the big blind starts after the flop
+            return self.current_bb.seat
+        return (self.dealer_position + 1) % len(self.players)
 
     def betting_order(self):
-        if len(self.players) == 2: # When only 2 players are left, the order is fixed
-            if self.state == "preflop":
-                return [self.current_sb, self.current_bb]
-            return [self.current_bb, self.current_sb]
-        else:
-            if self.state == "preflop": # Order is different to rest of round
-                first = (self.players.index(self.current_bb) + 1) % len(self.players)
-            else:
-                first = (self.dealer_position + 1) % len(self.players)
-            return [self.players[(first + i) % len(self.players)] for i in range(len(self.players))]
+        return list(self.seats.ring(self.first_to_act()))
     
     def valid_actions(self, player, to_call: int)-> list:
         if not player.is_active:
@@ -151,27 +258,58 @@ class Game:
                 actions.append("all-in")
 
         return list(dict.fromkeys(actions)) # no repetitions
+
+    def observation(self, player, to_call: int) -> dict:
+        return {
+            "name": player.name,
+            "seat": player.id,
+            "hand": list(player.hand),
+            "chips": player.chips,
+            "bet": player.bet,
+            "to_call": to_call,
+            "current_bet": self.current_bet,
+            "min_raise_to": self.current_bet + 1,
+            "max_raise_to": player.bet + player.chips,
+            "pot": self.table.total_pot(),
+            "board": list(self.table.board),
+            "state": self.state,
+            "round": self.round,
+            "big_blind": self.big_blind,
+            "players": [
+                {"name": p.name, "seat": p.id, "chips": p.chips, "bet": p.bet, "folded": p.folded, "all_in": p.all_in}
+                for p in self.players
+            ],
+        }
     
-    def process_action(self, player, action: str, to_call: int = 0, raise_to: Optional[int] = None) -> bool:
+    def process_action(self, player, action: str, to_call: int = 0, raise_to: int | None = None) -> bool:
         """
         Processes a player's action during betting.
 
         Raises:
             ValueError: If the action is invalid or cannot be processed.
         """
+        if self.stats is not None:
+            self.stats.count("process_action")
+        if self.undo_log is not None:
+            pot = self.table.pot
+            self.undo_log.append((ACTION, player, player.chips, player.bet, player.folded, player.all_in, player.hand,
+                                  self.current_bet, self.state, pot.contributions.get(player), pot.total))
+
         if action == "fold":
             player.fold()
-            print(f"{player.name} has folded.")
+            self.record_action(player, action, 0)
             return True
 
         elif action == "check":
-            print(f"{player.name} checks.")
+            self.record_action(player, action, 0)
             return True
 
         elif action == "call":
             player.bet_chips(to_call)
-            eligible_players = set(self.get_active_nonfolded_players())  # Eligible players for pot
-            self.table.add_to_pot(to_call, eligible_players=eligible_players)
+            if player.chips == 0:
+                player.all_in = True
+            self.table.add_to_pot(player, to_call)
+            self.record_action(player, action, to_call)
             return True
 
         elif action == "raise":
@@ -181,130 +319,145 @@ class Game:
             if raise_amount > player.chips:
                 raise ValueError("Not enough chips to raise.")
             player.bet_chips(raise_amount)
+            if player.chips == 0:
+                player.all_in = True
             self.current_bet = raise_to
-            eligible_players = set(self.get_active_nonfolded_players())  # Eligible players for pot
-            self.table.add_to_pot(raise_amount, eligible_players=eligible_players)
-            print(f"{player.name} raises to {raise_to}.")
+            self.table.add_to_pot(player, raise_amount)
+            self.record_action(player, action, raise_amount, raised=True)
             return True
 
         elif action == "all-in":
             all_in_amount = player.chips
             player.go_all_in()
-            eligible_players = set(self.get_active_nonfolded_players())  # Eligible players for pot
-            self.table.add_to_pot(all_in_amount, eligible_players=eligible_players)
-            if all_in_amount + player.bet > self.current_bet:
-                self.current_bet = all_in_amount + player.bet
-                print(f"{player.name} goes all-in for {all_in_amount} and sets new bet of {self.current_bet}.")
-            else:
-                print(f"{player.name} goes all-in for {all_in_amount}.")
+            self.table.add_to_pot(player, all_in_amount)
+            raised = player.bet > self.current_bet # go_all_in already added the chips to player.bet
+            if raised:
+                self.current_bet = player.bet
+            self.record_action(player, action, all_in_amount, raised)
             return True
 
         else:
             raise ValueError("Unknown action.")
 
     
+    def record_action(self, player, action: str, amount: int, raised: bool = False) -> None:
+        if self.recorder is not None:
+            self.recorder.action(player, action, amount)
+        if self.events is not None:
+            self.events.handle(ActionTaken(player, action, amount, self.current_bet, raised, self.state))
+
     def betting_round(self) -> None:
-        players_in_hand = [p for p in self.players if not p.folded and p.is_active]
-        if len(players_in_hand) <= 1:
-            print("Not enough players to continue betting.")
+        for player in self.betting_turns():
+            self.take_action(player)
+
+    def betting_turns(self):
+        """
+        Yields each player due to act in the current betting round. The caller
+        has the player act (take_action, or an async equivalent) before
+        asking for the next one.
+        """
+        seats = self.seats
+        active = seats.active
+        if seats.in_hand_count() <= 1 or not active or (
+                active.bit_count() == 1 and seats.players_in(active)[0].bet >= self.current_bet):
+            if self.events is not None:
+                self.events.handle(BettingSkipped(self.state))
             return
 
-        action_order = self.betting_order()
-        action_order = [player for player in action_order if player.is_active and not player.folded]
+        # Everyone who can act does so at least once, and again after each raise
+        to_act = active
+        position = self.first_to_act()
+        while to_act:
+            if seats.in_hand_count() == 1:
+                break
 
-        last_raiser = None
-        index = 0
-        num_players = len(action_order)
+            seat = seats.next_seat(to_act, position)
+            player = seats.players[seat]
+            to_act &= ~(1 << seat)
+            position = seat + 1
 
-        while True:
-            if len([p for p in self.players if p.is_active and not p.folded]) <= 1:
-                break
+            if player.bet >= self.current_bet and seats.active_count() == 1:
+                continue # nobody left to bet against
 
-            player = action_order[index % num_players]
-
-            if player.folded or player.all_in or not player.is_active:
-                index += 1
-                continue
-
-            to_call = self.current_bet - player.bet
-            valid_actions = self.valid_actions(player, to_call)
-
-            valid_action_chosen = False
-            while not valid_action_chosen:
-                action = input(f"\n{player.name}'s turn. Chips: {player.chips}, To call: {to_call}\nValid actions: {', '.join(valid_actions)}\nChoose action: ").strip().lower()
-                if action not in valid_actions:
-                    print("Invalid action, try again.")
-                    continue
-
-                raise_to = None
-                if action == "raise":
-                    while True:
-                        try:
-                            raise_to_input = input("Enter total bet amount: ").strip()
-                            raise_to = int(raise_to_input)
-                        except ValueError:
-                            print("Invalid amount. Please enter a valid integer.")
-                            continue
-
-                        if raise_to <= player.bet or raise_to - player.bet <= to_call:
-                            print("Raise amount too low.")
-                            continue
-
-                        if raise_to - player.bet > player.chips:
-                            print("Not enough chips to raise that amount.")
-                            continue
-
-                        break
-
-                try:
-                    if self.process_action(player, action, to_call, raise_to):
-                        valid_action_chosen = True
-                    else:
-                        print("Action failed validation, please try again.")
-                except ValueError as err:
-                    print(err)
-                    # retry input
-
-                if valid_action_chosen:
-                    if action == "raise" or (action == "all-in" and player.bet > self.current_bet):
-                        last_raiser = player
-                        index = (action_order.index(player) + 1) % num_players
-                        continue  # Restart loop with updated index
-
-            index += 1
-
-
-            if last_raiser is None:
-                if index >= num_players:
-                    break
+            previous_bet = self.current_bet
+            yield player
+            if self.current_bet > previous_bet:
+                to_act = seats.active & ~(1 << seat)
+
+    def take_action(self, player) -> None:
+        to_call = self.current_bet - player.bet
+        valid_actions = self.valid_actions(player, to_call)
+        agent = self.agents[player]
+
+        for _ in range(self.max_attempts):
+            if self.stats is None:
+                decision = agent.act(self.observation(player, to_call), valid_actions)
             else:
-                if index % num_players == action_order.index(last_raiser):
-                    break
+                start = time.perf_counter()
+                decision = agent.act(self.observation(player, to_call), valid_actions)
+                self.stats.add("agent", time.perf_counter() - start)
+            if self.apply_decision(player, decision, to_call, valid_actions):
+                return
+
+        if self.events is not None:
+            self.events.handle(ForcedFold(player, "did not choose a valid action"))
+        self.process_action(player, "fold")
+
+    def apply_decision(self, player, decision, to_call: int, valid_actions: list) -> bool:
+        """Processes an agent's decision, False (after logging why) when it has to be asked again."""
+        action, raise_to = decision if isinstance(decision, tuple) else (decision, None)
+        if action not in valid_actions:
+            reason = "Invalid action, try again."
+        else:
+            try:
+                if self.process_action(player, action, to_call, raise_to):
+                    return True
+                reason = "Action failed validation, please try again."
+            except ValueError as err:
+                reason = str(err)
+        if self.events is not None:
+            self.events.handle(DecisionRejected(player, reason))
+        return False
 
 
     def showdown(self):
+        if self.undo_log is not None:
+            self._log_payout()
         board = self.table.board
-        pots = self.table.pots  # List of dicts with 'amount' and 'players' keys
+
+        board_mask = 0
+        for card in board:
+            board_mask |= card.mask
 
         hand_strengths = {}
+        recomputed = 0
         for player in self.players:
             if not player.folded:
-                hand_strengths[player] = evaluate_hand(player.hand, board)
+                # Table.deal_board kept player.strength up to date; it only
+                # goes stale when the board was changed some other way
+                strength = player.strength
+                mask = board_mask
+                for card in player.hand:
+                    mask |= card.mask
+                if strength is not None and strength.mask == mask:
+                    hand_strengths[player] = strength.score
+                else:
+                    hand_strengths[player] = evaluate_hand(player.hand, board)
+                    recomputed += 1
+        if self.stats is not None:
+            self.stats.count("evaluate_hand", len(hand_strengths))
+            if recomputed:
+                self.stats.count("evaluate_hand_recomputed", recomputed)
 
         winnings = {p: 0 for p in self.players}
 
-        for pot in pots:
-            # Filter eligible players for this pot
-            eligible_players = [p for p in pot['players'] if not p.folded]
-            if not eligible_players:
-                print("A pot has no eligible players.")
-                continue
-
+        # Side pots are built here, once, from what each player committed
+        for amount, eligible_players in self.table.side_pots():
             best_score = min(hand_strengths[p] for p in eligible_players)
             winners = [p for p in eligible_players if hand_strengths[p] == best_score]
 
-            split_amount = pot['amount'] // len(winners)
-            remainder = pot['amount'] % len(winners)
+            split_amount = amount // len(winners)
+            remainder = amount % len(winners)
 
             for winner in winners:
                 winnings[winner] += split_amount
@@ -312,12 +465,18 @@ class Game:
             if remainder > 0:
                 winnings[winners[0]] += remainder # convention
 
+        events = self.events
+        if events is not None:
+            events.handle(ShowdownResult(hand_strengths, winnings))
         for player, amount in winnings.items():
             if amount > 0:
                 player.chips += amount
-                print(f"{player.name} wins {amount} chips.")
+                if events is not None:
+                    events.handle(PotAwarded(player, amount, showdown=True))
 
-        self.table.pots = []
+        if self.recorder is not None:
+            self.recorder.end_hand(winnings, self.table.total_pot(), showdown=True)
+        self.table.pot.clear()
 
 
     
@@ -325,53 +484,62 @@ class Game:
     def handle_early_hand_end(self) -> bool:
         if self.only_one_player_left():
             self.award_last_player()
-            self.game_over = True
             return True
         return False
 
+    def remove_busted_players(self) -> None:
+        if any(p.chips == 0 for p in self.players):
+            self.table.remove_busted_players()  # announces each elimination
+            self.players = self.table.players
+        if len(self.players) == 1:
+            if self.events is not None:
+                self.events.handle(GameWon(self.players[0]))
+            self.game_over = True
 
 
-    def play_hand(self) -> None:
-        self.start_round()
-        stages = [
-            ("preflop", self.betting_round),
+    def stages(self) -> list:
+        """The states of a hand in order, each with its dealing step (None for a betting round)."""
+        return [
+            ("preflop", None),
             ("flop", self.deal_flop),
-            ("flop_bet", self.betting_round),
+            ("flop_bet", None),
             ("turn", self.deal_turn),
-            ("turn_bet", self.betting_round),
+            ("turn_bet", None),
             ("river", self.deal_river),
-            ("river_bet", self.betting_round),
+            ("river_bet", None),
         ]
 
-        for state, action in stages:
+    def play_hand(self) -> None:
+        if self.stats is not None:
+            start = time.perf_counter()
+        self.start_round()
+        for state, deal in self.stages():
             self.state = state
-            action()
+            self._stage(state, deal or self.betting_round)
             if self.handle_early_hand_end():
-                return
-
-        self.showdown()
+                break
+        else:
+            self._stage("showdown", self.showdown)
 
-        self.players = [p for p in self.players if p.chips > 0]
-        if len(self.players) == 1:
-            print(f"{self.players[0].name} wins the game!")
-            self.game_over = True
+        self.remove_busted_players()
+        if self.stats is not None:
+            self.stats.add("hand", time.perf_counter() - start)
 
     def run_game(self):
         while not self.game_over:
             self.play_hand()
             if self.game_over:
-                print("Game over!")
+                self.log("Game over!")
                 winner = self.players[0] if self.players else None
                 if winner:
-                    print(f"{winner.name} is the champion!")
+                    self.log(f"{winner.name} is the champion!")
                 break
 
             while True:
                 cont = input("Play next hand? (y/n): ").strip().lower()
-                if cont == 'n':
-                    print("Game stopped by user.")
+                if cont in ('y', 'n'):
                     break
-                elif cont != 'y':
-                    print("Invalid input. Please enter 'y' or 'n'.")
-                    continue
-            break
\ No newline at end of file
+                print("Invalid input. Please enter 'y' or 'n'.")
+            if cont == 'n':
+                print("Game stopped by user.")
+                break
@@ -1,37 +1,690 @@
-from treys import Evaluator, Card
+import mmap
+import os
+import sys
+import threading
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import combinations, combinations_with_replacement
+from math import comb
 
+from .files import replace_file
 
-evaluator = Evaluator()
+# Scores follow treys: 1 is a royal flush, 7462 is 7-5-4-3-2 offsuit, lower is better.
+MAX_ROYAL_FLUSH = 1
+MAX_STRAIGHT_FLUSH = 10
+MAX_FOUR_OF_A_KIND = 166
+MAX_FULL_HOUSE = 322
+MAX_FLUSH = 1599
+MAX_STRAIGHT = 1609
+MAX_THREE_OF_A_KIND = 2467
+MAX_TWO_PAIR = 3325
+MAX_PAIR = 6185
+MAX_HIGH_CARD = 7462
 
-def card_to_treys_str(card):
-    rank_map = {
-        14: 'A', 13: 'K', 12: 'Q', 11: 'J',
-        10: 'T', 9: '9', 8: '8', 7: '7', 6: '6',
-        5: '5', 4: '4', 3: '3', 2: '2',
-        'A': 'A', 'K': 'K', 'Q': 'Q', 'J': 'J', 'T': 'T',
-        '9': '9', '8': '8', '7': '7', '6': '6',
-        '5': '5', '4': '4', '3': '3', '2': '2'
-    }
-    suit_map = {
-        '♥': 'h',
-        '♦': 'd',
-        '♣': 'c',
-        '♠': 's'
-    }
+RANK_CLASS_MAX = [
+    MAX_ROYAL_FLUSH, MAX_STRAIGHT_FLUSH, MAX_FOUR_OF_A_KIND, MAX_FULL_HOUSE, MAX_FLUSH,
+    MAX_STRAIGHT, MAX_THREE_OF_A_KIND, MAX_TWO_PAIR, MAX_PAIR, MAX_HIGH_CARD,
+]
+RANK_CLASS_STRINGS = [
+    "Royal Flush", "Straight Flush", "Four of a Kind", "Full House", "Flush",
+    "Straight", "Three of a Kind", "Two Pair", "Pair", "High Card",
+]
 
-    rank = rank_map[card.rank]
-    suit = suit_map[card.suit]
-    return rank + suit
+# Rank bitmasks (bit 0 is a deuce) from broadway down to the wheel
+STRAIGHTS = [0b1111100000000 >> i for i in range(9)] + [0b1000000001111]
+
+def _desc(*ranks) -> tuple:
+    return tuple(sorted(ranks, reverse=True))
+
+
+def _five_card_scores() -> tuple[dict, dict]:
+    """
+    Scores every distinct 5-card hand in treys order.
+
+    Returns a dict of flush scores keyed by rank bitmask and a dict of
+    non-flush scores keyed by the ranks sorted high to low.
+    """
+    flushes, unsuited = {}, {}
+    desc = range(12, -1, -1)
+    score = 1
+
+    for mask in STRAIGHTS:
+        flushes[mask] = score
+        score += 1
+    for quad in desc:
+        for kicker in desc:
+            if kicker != quad:
+                unsuited[_desc(quad, quad, quad, quad, kicker)] = score
+                score += 1
+    for trips in desc:
+        for pair in desc:
+            if pair != trips:
+                unsuited[_desc(trips, trips, trips, pair, pair)] = score
+                score += 1
+    for ranks in combinations(desc, 5):
+        mask = sum(1 << r for r in ranks)
+        if mask not in STRAIGHTS:
+            flushes[mask] = score
+            score += 1
+    for mask in STRAIGHTS:
+        unsuited[_desc(*(r for r in range(13) if mask >> r & 1))] = score
+        score += 1
+    for trips in desc:
+        for kickers in combinations([r for r in desc if r != trips], 2):
+            unsuited[_desc(trips, trips, trips, *kickers)] = score
+            score += 1
+    for high, low in combinations(desc, 2):
+        for kicker in desc:
+            if kicker != high and kicker != low:
+                unsuited[_desc(high, high, low, low, kicker)] = score
+                score += 1
+    for pair in desc:
+        for kickers in combinations([r for r in desc if r != pair], 3):
+            unsuited[_desc(pair, pair, *kickers)] = score
+            score += 1
+    for ranks in combinations(desc, 5):
+        if sum(1 << r for r in ranks) not in STRAIGHTS:
+            unsuited[ranks] = score
+            score += 1
+
+    return flushes, unsuited
+
+
+# _MULTISET_WEIGHTS[i][r] is the contribution of rank r at sorted position i
+_MULTISET_WEIGHTS = [[comb(r + i, i + 1) for r in range(13)] for i in range(7)]
+
+
+def _multiset_index(sorted_ranks) -> int:
+    return sum(_MULTISET_WEIGHTS[i][r] for i, r in enumerate(sorted_ranks))
+
+
+def _extend(table: list, n: int) -> list:
+    """
+    Rank table for n + 1 cards built from the one for n cards: the best hand
+    among n + 1 ranks is the best among their n-rank subsets.
+    """
+    weights = _MULTISET_WEIGHTS
+    worst = MAX_HIGH_CARD + 1
+    extended = [worst] * comb(13 + n, n + 1)
+
+    for ranks in combinations_with_replacement(range(13), n):
+        prefix = [0]
+        for i, rank in enumerate(ranks):
+            prefix.append(prefix[-1] + weights[i][rank])
+        score = table[prefix[n]]
+        if not score:
+            continue  # five of a kind
+        suffix = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + weights[i + 1][ranks[i]]
+
+        position = 0
+        for rank in range(13):
+            while position < n and ranks[position] <= rank:
+                position += 1
+            if position >= 4 and ranks[position - 4] == rank:
+                continue  # already four of this rank
+            index = prefix[position] + weights[position][rank] + suffix[position]
+            if score < extended[index]:
+                extended[index] = score
+
+    return [0 if score == worst else score for score in extended]
+
+
+def _build_tables() -> tuple[list, dict]:
+    flushes, unsuited = _five_card_scores()
+
+    # Best flush (or straight flush) for any set of 5+ ranks in one suit
+    flush_table = [0] * 8192
+    for mask in range(8192):
+        if mask.bit_count() < 5:
+            continue
+        for straight in STRAIGHTS:
+            if mask & straight == straight:
+                flush_table[mask] = flushes[straight]
+                break
+        else:
+            top = mask
+            while top.bit_count() > 5:
+                top &= top - 1  # drop the lowest rank
+            flush_table[mask] = flushes[top]
+
+    # Best non-flush score for every multiset of 5, 6 or 7 ranks, indexed by
+    # its position in the combinatorial number system (see _multiset_index)
+    table = [0] * comb(17, 5)
+    for ranks, score in unsuited.items():
+        table[_multiset_index(ranks[::-1])] = score
+    rank_tables = {5: table}
+    for n in (5, 6):
+        table = rank_tables[n + 1] = _extend(table, n)
+
+    return flush_table, rank_tables
+
+
+# Built (or read from the cache file) on the first evaluation, not at import
+FLUSH_TABLE = None
+RANK_TABLES = None
+
+TABLE_CACHE_MAGIC = b"SPEV\x02\x00"  # evaluator tables, format version 2
+TABLE_SIZES = [8192, comb(17, 5), comb(18, 6), comb(19, 7)]  # flush table, then 5, 6 and 7 card rank tables
+# The magic, then the CRC32 of the uint16 payload
+TABLE_CACHE_HEADER = len(TABLE_CACHE_MAGIC) + 4
+TABLE_CACHE_SIZE = TABLE_CACHE_HEADER + 2 * sum(TABLE_SIZES)
+
+
+def table_cache_path() -> str:
+    """Where the tables are cached: $SUBPOKER_CACHE_DIR, else ~/.cache/subpoker."""
+    directory = os.environ.get("SUBPOKER_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "subpoker")
+    return os.path.join(directory, "evaluator_tables.bin")
+
+
+def _table_cache_ok(data) -> bool:
+    """Whether data (bytes or an mmap) is a whole, uncorrupted cache file."""
+    if len(data) != TABLE_CACHE_SIZE or data[:len(TABLE_CACHE_MAGIC)] != TABLE_CACHE_MAGIC:
+        return False
+    checksum = int.from_bytes(data[len(TABLE_CACHE_MAGIC):TABLE_CACHE_HEADER], "little")
+    with memoryview(data) as view:  # released right away, an mmap cannot close while viewed
+        return zlib.crc32(view[TABLE_CACHE_HEADER:]) == checksum
+
+
+def _read_table_cache(path: str):
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if not _table_cache_ok(data):
+        return None  # truncated, corrupted or from another version: the caller rebuilds it
+    values = array("H")
+    values.frombytes(data[TABLE_CACHE_HEADER:])
+    values = values.tolist()
+    tables = []
+    start = 0
+    for size in TABLE_SIZES:
+        tables.append(values[start:start + size])
+        start += size
+    return tables[0], {5: tables[1], 6: tables[2], 7: tables[3]}
+
+
+def _write_table_cache(path: str, flush_table: list, rank_tables: dict) -> None:
+    values = array("H", flush_table)
+    for n in (5, 6, 7):
+        values.extend(rank_tables[n])
+    payload = values.tobytes()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = TABLE_CACHE_MAGIC + zlib.crc32(payload).to_bytes(4, "little")
+        replace_file(path, lambda file: file.writelines((header, payload)))
+    except OSError:
+        pass  # a read-only home only costs the rebuild next time
+
+
+def load_tables() -> tuple[list, dict]:
+    """Makes FLUSH_TABLE and RANK_TABLES available, from the cache file when it is valid."""
+    global FLUSH_TABLE, RANK_TABLES
+    if FLUSH_TABLE is None:
+        path = table_cache_path()
+        tables = _read_table_cache(path)
+        if tables is None:
+            tables = _build_tables()
+            _write_table_cache(path, *tables)
+        FLUSH_TABLE, RANK_TABLES = tables
+    return FLUSH_TABLE, RANK_TABLES
+
+
+_table_map = None  # the cache file's mmap once attach_tables has succeeded
+
+
+def share_tables(path: str | None = None) -> str | None:
+    """
+    Makes sure a valid cache file is at path (default table_cache_path())
+    and returns the path, or None when it cannot be written. Call it in the
+    parent before starting a pool so the workers do not all rebuild it.
+    """
+    if path is None:
+        path = table_cache_path()
+    if not _table_cache_valid(path):
+        tables = _build_tables() if FLUSH_TABLE is None else (FLUSH_TABLE, RANK_TABLES)
+        _write_table_cache(path, *tables)
+        if not _table_cache_valid(path):
+            return None
+    return path
+
+
+def _table_cache_valid(path: str) -> bool:
+    try:
+        with open(path, "rb") as file:
+            return _table_cache_ok(file.read())
+    except OSError:
+        return False
+
+
+def attach_tables(path: str | None = None) -> bool:
+    """
+    Points FLUSH_TABLE and RANK_TABLES at a read-only memory map of the
+    cache file instead of private lists, so every process evaluating hands
+    shares one copy through the page cache. Meant as a pool initializer:
+
+        ProcessPoolExecutor(initializer=attach_tables, initargs=(share_tables(),))
+
+    Indexing the mapped tables is a little slower than indexing lists. A
+    missing or damaged file is rewritten first (see share_tables); False,
+    leaving the tables as they were, means it could not be. A forked child
+    of an attached process stays attached.
+    """
+    global FLUSH_TABLE, RANK_TABLES, _table_map, _numpy_tables
+    if _table_map is not None:
+        return True
+    if path is None:
+        path = table_cache_path()
+    mapped = _map_table_cache(path)
+    if mapped is None:
+        if share_tables(path) is None:
+            return False
+        mapped = _map_table_cache(path)
+        if mapped is None:
+            return False
+    values = memoryview(mapped)[TABLE_CACHE_HEADER:].cast("H")
+    tables = []
+    start = 0
+    for size in TABLE_SIZES:
+        tables.append(values[start:start + size])
+        start += size
+    FLUSH_TABLE, RANK_TABLES = tables[0], {5: tables[1], 6: tables[2], 7: tables[3]}
+    _table_map = mapped
+    _numpy_tables = None
+    return True
+
+
+def _map_table_cache(path: str):
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if not _table_cache_ok(mapped):
+        mapped.close()
+        return None
+    return mapped
+
+
+def table_memory() -> dict:
+    """
+    Bytes this process spends on the evaluator tables: "private" is what it
+    holds itself, "saved" what private lists would cost on top of that (0
+    unless the tables are mapped) and "shared" the mapping shared with the
+    other attached processes.
+    """
+    flush_table, rank_tables = load_tables()
+    tables = [flush_table, rank_tables[5], rank_tables[6], rank_tables[7]]
+    # A list holds a pointer per entry, and ints above 256 are separate objects
+    as_lists = sum(sys.getsizeof([]) + 8 * len(table) + sys.getsizeof(1000) * sum(1 for v in table if v > 256)
+                   for table in tables)
+    if _table_map is None:
+        return {"mapped": False, "private": as_lists, "shared": 0, "saved": 0}
+    private = sum(sys.getsizeof(table) for table in tables)
+    return {"mapped": True, "private": private, "shared": len(_table_map), "saved": as_lists - private}
+
+
+def evaluate_cards(cards) -> int:
+    """Scores 5 to 7 cards with treys semantics (lower is better)."""
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return _evaluate_mask(mask, cards)
+
+
+def _evaluate_mask(mask: int, cards) -> int:
+    if FLUSH_TABLE is None:
+        load_tables()
+    for shift in (0, 13, 26, 39):
+        score = FLUSH_TABLE[(mask >> shift) & 0x1FFF]
+        if score:
+            return score
+
+    ranks = sorted([card.rank_index for card in cards])
+    weights = _MULTISET_WEIGHTS
+    return RANK_TABLES[len(ranks)][sum(weights[i][r] for i, r in enumerate(ranks))]
+
+
+class EvaluationCache:
+    """
+    Bounded LRU cache of scores keyed by the OR of the card masks, which is
+    the same for any order of the same cards. Safe to share between threads:
+    scoring happens outside the lock, only the bookkeeping is inside it.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        self.capacity = capacity  # 0 disables caching
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def evaluate(self, cards) -> int:
+        key = 0
+        for card in cards:
+            key |= card.mask
+        if not self.capacity:
+            return _evaluate_mask(key, cards)
+        scores = self._scores
+        with self._lock:
+            score = scores.get(key)
+            if score is not None:
+                scores.move_to_end(key)
+                self.hits += 1
+                return score
+            self.misses += 1
+        score = _evaluate_mask(key, cards)
+        with self._lock:
+            scores[key] = score
+            if len(scores) > self.capacity:
+                scores.popitem(last=False)
+        return score
+
+    def get_many(self, keys: list) -> list:
+        """Cached score per key, None for misses. Counts hits and misses."""
+        scores = self._scores
+        with self._lock:
+            found = [scores.get(key) for key in keys]
+            for key, score in zip(keys, found):
+                if score is not None:
+                    scores.move_to_end(key)
+            n_hits = len(found) - found.count(None)
+            self.hits += n_hits
+            self.misses += len(found) - n_hits
+        return found
+
+    def put(self, key: int, score: int) -> None:
+        self.put_many([key], [score])
+
+    def put_many(self, keys: list, scores: list) -> None:
+        if not self.capacity:
+            return
+        cached = self._scores
+        with self._lock:
+            for key, score in zip(keys, scores):
+                cached[key] = score
+            while len(cached) > self.capacity:
+                cached.popitem(last=False)
+
+    def warm(self, card_sets) -> None:
+        """Scores every card list in card_sets ahead of time, e.g. recurring flops with common hands."""
+        card_sets = [list(cards) for cards in card_sets]
+        keys = []
+        for cards in card_sets:
+            key = 0
+            for card in cards:
+                key |= card.mask
+            keys.append(key)
+        self.put_many(keys, [evaluate_cards(cards) for cards in card_sets])
+
+    def resize(self, capacity: int) -> None:
+        self.capacity = capacity
+        with self._lock:
+            while len(self._scores) > capacity:
+                self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self) -> str:
+        return (f"EvaluationCache({len(self._scores)}/{self.capacity} entries, "
+                f"{self.hits} hits, {self.misses} misses)")
+
+
+# Shared by evaluate_hand and evaluate_many, off until given a capacity
+# (cache.resize(1 << 16)). A table lookup is about as fast as a cache hit, so
+# it only pays off when the same card sets really come back, e.g. after warm().
+cache = EvaluationCache(0)
 
 
 def evaluate_hand(player_hand, board):
-    
-    treys_hand = [Card.new(card_to_treys_str(card)) for card in player_hand]
-    treys_board = [Card.new(card_to_treys_str(card)) for card in board]
-    return evaluator.evaluate(treys_board, treys_hand)
+    if not cache.capacity:
+        return evaluate_cards(player_hand + board)
+    return cache.evaluate(player_hand + board)
+
+
+_numpy_tables = None
+
+
+def _get_numpy_tables():
+    global _numpy_tables
+    if _numpy_tables is None:
+        import numpy as np
+        flush_table, rank_tables = load_tables()
+        if _table_map is not None:
+            # Scores fit in 15 bits, so the mapped uint16 data reads the same as int16, without a copy
+            values = np.frombuffer(_table_map, dtype=np.int16, offset=TABLE_CACHE_HEADER)
+            bounds = np.cumsum([0] + TABLE_SIZES)
+            flush_table = values[:bounds[1]]
+            rank_tables = {n: values[bounds[i]:bounds[i + 1]] for i, n in ((1, 5), (2, 6), (3, 7))}
+        _numpy_tables = (
+            np.asarray(flush_table, dtype=np.int16),
+            {n: np.asarray(table, dtype=np.int16) for n, table in rank_tables.items()},
+            np.array(_MULTISET_WEIGHTS, dtype=np.int32),
+        )
+    return _numpy_tables
+
+
+def evaluate_indices(cards):
+    """
+    Vectorized evaluate_cards over an (N, n) integer array of 0-51 card
+    indices, n being 5, 6 or 7. Returns an int16 array of N scores.
+    """
+    import numpy as np
+    flush_table, rank_tables, weights = _get_numpy_tables()
+
+    cards = np.asarray(cards, dtype=np.intp)  # narrower ints would overflow the rank bits
+    n = cards.shape[1]
+    ranks = cards % 13
+    suits = cards // 13
+    bits = np.left_shift(1, ranks)
+
+    # Ranks are distinct within a suit, so summing the bits is the same as OR-ing them.
+    # At most one suit can hold five of seven cards, so the largest flush score wins.
+    flush = np.zeros(len(cards), dtype=np.int16)
+    for suit in range(4):
+        suit_bits = np.where(suits == suit, bits, 0).sum(axis=1)
+        np.maximum(flush, flush_table[suit_bits], out=flush)
+
+    ranks.sort(axis=1)
+    index = weights[np.arange(n), ranks].sum(axis=1)
+    return np.where(flush > 0, flush, rank_tables[n][index])
+
+
+def evaluate_many(hands, boards):
+    """
+    Scores many (hand, board) pairs in one call.
+
+    hands and boards are either sequences of Card lists or integer arrays of
+    card indices; every board must have the same length. Uses NumPy when it
+    is installed and returns an array, otherwise falls back to a list.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [evaluate_hand(list(hand), list(board)) for hand, board in zip(hands, boards)]
+
+    hands = _as_index_array(np, hands)
+    boards = _as_index_array(np, boards)
+    if len(hands) != len(boards):
+        raise ValueError("hands and boards must have the same length.")
+    if len(hands) == 0:
+        return np.zeros(0, dtype=np.int16)
+    cards = np.concatenate([hands, boards], axis=1)
+    if not cache.capacity:
+        return evaluate_indices(cards)
+
+    # Score each distinct card set once, reusing the cache and filling it with the rest
+    keys = np.left_shift(np.uint64(1), cards.astype(np.uint64)).sum(axis=1, dtype=np.uint64)
+    unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    key_list = unique_keys.tolist()
+    found = cache.get_many(key_list)
+    scores = np.array([-1 if score is None else score for score in found], dtype=np.int16)
+    missing = np.flatnonzero(scores < 0)
+    if len(missing):
+        scores[missing] = evaluate_indices(cards[first[missing]])
+        cache.put_many([key_list[i] for i in missing.tolist()], scores[missing].tolist())
+    return scores[inverse]
+
+
+def _as_index_array(np, rows):
+    if isinstance(rows, np.ndarray):
+        return rows.astype(np.intp, copy=False)
+    return np.array([[card.index for card in row] for row in rows], dtype=np.intp).reshape(len(rows), -1)
+
+
+# What a rank adds to the multiset index when it moves from place i to i + 1
+_SHIFT_WEIGHTS = [[_MULTISET_WEIGHTS[i + 1][r] - _MULTISET_WEIGHTS[i][r] for r in range(13)] for i in range(6)]
+
+# Draw flags of a HandState, only set while cards are still to come
+FLUSH_DRAW = 1  # four to a flush
+BACKDOOR_FLUSH_DRAW = 2  # three to a flush on the flop
+OPEN_ENDED = 4  # two or more ranks complete a straight (open-ended or double gutshot)
+GUTSHOT = 8  # exactly one rank completes a straight
+DRAW_NAMES = {FLUSH_DRAW: "flush draw", BACKDOOR_FLUSH_DRAW: "backdoor flush draw",
+              OPEN_ENDED: "open-ended straight draw", GUTSHOT: "gutshot"}
+
+# Rank bitmasks for straight windows with the ace also at the bottom (bit 0 is an ace, bit 1 a deuce)
+_LOW_ACE_STRAIGHTS = [0b11111 << i for i in range(10)]
+
+
+class HandState:
+    """
+    A player's hand strength kept up to date as cards arrive: hole cards
+    first (Table.deal_private), then each street (Table.deal_board).
+
+    add() keeps everything the evaluator tables are indexed by: the card
+    mask, the suit that reached five cards if any, and the rank multiset
+    index (sorted ranks, only the ones after an inserted rank shift up a
+    weight). score is then a single FLUSH_TABLE or RANK_TABLES lookup;
+    draws are worked out from the mask on first access per street.
+    """
+
+    __slots__ = ("mask", "_ranks", "_index", "_suits", "_flush_shift", "_score", "_draws")
+
+    def __init__(self, cards=()):
+        self.mask = 0
+        self._ranks = []  # sorted
+        self._index = 0  # _multiset_index(self._ranks)
+        self._suits = [0, 0, 0, 0]  # cards per suit
+        self._flush_shift = -1  # mask shift of the suit with five cards or more
+        self.add(cards)
+
+    def add(self, cards) -> None:
+        ranks = self._ranks
+        suits = self._suits
+        index = self._index
+        mask = self.mask
+        for card in cards:
+            mask |= card.mask
+            suit = card.suit_index
+            count = suits[suit] = suits[suit] + 1
+            if count == 5:
+                self._flush_shift = 13 * suit
+            rank = card.rank_index
+            position = bisect_right(ranks, rank)
+            index += _MULTISET_WEIGHTS[position][rank]
+            for i in range(position, len(ranks)):  # the higher ranks move up one place
+                index += _SHIFT_WEIGHTS[i][ranks[i]]
+            ranks.insert(position, rank)
+        self.mask = mask
+        self._index = index
+        self._score = None
+        self._draws = None
+
+    @property
+    def suit_bits(self) -> list[int]:
+        mask = self.mask
+        return [mask & 0x1FFF, mask >> 13 & 0x1FFF, mask >> 26 & 0x1FFF, mask >> 39 & 0x1FFF]
+
+    @property
+    def ranks(self) -> list[int]:
+        """Rank indices of the cards, sorted."""
+        return list(self._ranks)
+
+    @property
+    def score(self) -> int | None:
+        """treys score (lower is better) once there are 5 cards, None before."""
+        if self._score is None and len(self._ranks) >= 5:
+            if FLUSH_TABLE is None:
+                load_tables()
+            if self._flush_shift >= 0:
+                self._score = FLUSH_TABLE[(self.mask >> self._flush_shift) & 0x1FFF]
+            else:
+                self._score = RANK_TABLES[len(self._ranks)][self._index]
+        return self._score
+
+    @property
+    def draws(self) -> int:
+        """Draw flags (FLUSH_DRAW, OPEN_ENDED, ...) on the flop and turn, 0 otherwise."""
+        if self._draws is None:
+            n = len(self._ranks)
+            self._draws = self._find_draws(n) if 5 <= n < 7 else 0
+        return self._draws
+
+    def _find_draws(self, n: int) -> int:
+        draws = 0
+        score = self.score
+        suit_bits = self.suit_bits
+        if score > MAX_FLUSH:  # no flush yet
+            for bits in suit_bits:
+                count = bits.bit_count()
+                if count == 4:
+                    draws |= FLUSH_DRAW
+                elif count == 3 and n == 5:
+                    draws |= BACKDOOR_FLUSH_DRAW
+        if score > MAX_STRAIGHT:  # nothing at straight or better
+            rank_bits = suit_bits[0] | suit_bits[1] | suit_bits[2] | suit_bits[3]
+            low = rank_bits << 1 | rank_bits >> 12  # ace counts low too
+            outs = 0
+            for window in _LOW_ACE_STRAIGHTS:
+                missing = window & ~low
+                if missing.bit_count() == 1:
+                    outs |= missing
+            outs = outs >> 1 | (outs & 1) << 12  # back to rank bits, a low ace is the ace
+            if outs.bit_count() >= 2:
+                draws |= OPEN_ENDED
+            elif outs:
+                draws |= GUTSHOT
+        return draws
+
+    @property
+    def rank_class(self) -> str:
+        """Made hand so far, e.g. "Two Pair"; before the flop only "Pair" or "High Card"."""
+        if self.score is not None:
+            return get_hand_rank_string(self.score)
+        return "Pair" if len(set(self._ranks)) < len(self._ranks) else "High Card"
+
+    def draw_names(self) -> list[str]:
+        return [name for flag, name in DRAW_NAMES.items() if self.draws & flag]
+
+    def __repr__(self) -> str:
+        return f"HandState({self.rank_class}, score={self.score}, draws={self.draw_names()})"
+
+
+def get_rank_class(score) -> int:
+    for rank_class, max_score in enumerate(RANK_CLASS_MAX):
+        if score <= max_score:
+            return rank_class
+    raise ValueError("Invalid hand rank, cannot return rank class")
 
 
 def get_hand_rank_string(score):
-    
-    rank_class = evaluator.get_rank_class(score)
-    return evaluator.class_to_string(rank_class)
+
+    rank_class = get_rank_class(score)
+    return RANK_CLASS_STRINGS[rank_class]
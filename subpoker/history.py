@@ -0,0 +1,182 @@
+import os
+import struct
+
+from .card import Card
+
+MAGIC = b"SPHH\x01\x00" # hand history file, format version 1
+
+# Every record is 12 bytes: kind, seat, code, card count, amount, up to 3 card indices
+RECORD = struct.Struct("<BBBBi3Bx")
+NO_CARD = 255
+NO_SEAT = 255
+
+HAND, SEAT, HOLE, ACTION, BOARD, WIN, END = range(7)
+
+ACTIONS = ["fold", "check", "call", "raise", "all-in", "small blind", "big blind"]
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+STREETS = ["preflop", "flop", "turn", "river"]
+
+
+def pack(kind: int, seat: int = NO_SEAT, code: int = 0, amount: int = 0, cards=()) -> bytes:
+    indices = [card.index for card in cards] + [NO_CARD] * (3 - len(cards))
+    return RECORD.pack(kind, seat, code, len(cards), amount, *indices)
+
+
+class HandHistoryWriter:
+    """
+    Appends fixed-width binary records for every hand a Game plays.
+
+    Records are collected in memory and written out every flush_every hands
+    (and on close), so recording costs no system call per action. Attach it
+    with Game(..., recorder=writer) or game.recorder = writer.
+
+    An existing file is appended to after checking it is a history file and
+    cutting off whatever a crash left after its last complete hand.
+    """
+
+    def __init__(self, path: str, flush_every: int = 100):
+        self.path = path
+        self.flush_every = flush_every
+        if os.path.exists(path) and os.path.getsize(path):
+            _truncate_to_last_hand(path)
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._buffer = bytearray()
+        self._pending_hands = 0
+        self.hands_written = 0
+
+    def start_hand(self, game) -> None:
+        players = game.players
+        buffer = self._buffer
+        buffer += pack(HAND, game.dealer_position, len(players), game.round)
+        for player in players:
+            # Chips before the blinds went in
+            buffer += pack(SEAT, player.seat, player.id, player.chips + player.bet)
+        buffer += pack(ACTION, game.current_sb.seat, ACTION_CODES["small blind"], game.current_sb.bet)
+        buffer += pack(ACTION, game.current_bb.seat, ACTION_CODES["big blind"], game.current_bb.bet)
+        for player in players:
+            buffer += pack(HOLE, player.seat, cards=player.hand)
+
+    def action(self, player, action: str, amount: int) -> None:
+        self._buffer += pack(ACTION, player.seat, ACTION_CODES[action], amount)
+
+    def board(self, street: int, cards: list) -> None:
+        self._buffer += pack(BOARD, code=street, cards=cards)
+
+    def end_hand(self, winnings: dict, pot: int, showdown: bool) -> None:
+        buffer = self._buffer
+        for player, amount in winnings.items():
+            if amount > 0:
+                buffer += pack(WIN, player.seat, int(showdown), amount)
+        buffer += pack(END, code=int(showdown), amount=pot)
+
+        self.hands_written += 1
+        self._pending_hands += 1
+        if self._pending_hands >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+        self._pending_hands = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "HandHistoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _truncate_to_last_hand(path: str, chunk_records: int = 4096) -> None:
+    size = RECORD.size
+    with open(path, "r+b") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a hand history file.")
+        records = (os.path.getsize(path) - len(MAGIC)) // size  # a torn last record is dropped
+        # Walk back from the end to the last END record
+        end = records
+        while end > 0:
+            start = max(end - chunk_records, 0)
+            file.seek(len(MAGIC) + start * size)
+            chunk = file.read((end - start) * size)
+            kinds = chunk[::size]
+            last = kinds.rfind(bytes([END]))
+            if last >= 0:
+                end = start + last + 1
+                break
+            end = start
+        file.truncate(len(MAGIC) + end * size)
+
+
+class HandHistory:
+    """One hand read back from a history file. Seats are indices into seats."""
+
+    def __init__(self, round: int, dealer: int):
+        self.round = round
+        self.dealer = dealer
+        self.seats = [] # (player id, chips at the start of the hand)
+        self.hole_cards = {} # seat -> [Card, Card]
+        self.actions = [] # (street, seat, action, chips put in)
+        self.board = []
+        self.winnings = {} # seat -> chips won
+        self.pot = 0
+        self.showdown = False
+
+    def __repr__(self) -> str:
+        return f"HandHistory(round {self.round}, {len(self.seats)} seats, pot {self.pot}, showdown={self.showdown})"
+
+
+def iter_records(path: str, chunk_records: int = 4096):
+    """Yields (kind, seat, code, cards, amount) tuples, reading the file in chunks."""
+    size = RECORD.size
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a hand history file.")
+        while True:
+            chunk = file.read(size * chunk_records)
+            if not chunk:
+                return
+            usable = len(chunk) - len(chunk) % size # a torn last record is ignored
+            for kind, seat, code, n_cards, amount, *cards in RECORD.iter_unpack(chunk[:usable]):
+                yield kind, seat, code, cards[:n_cards], amount
+
+
+def iter_hands(path: str):
+    """Yields every complete hand in the file as a HandHistory, one at a time."""
+    return hands_from_records(iter_records(path))
+
+
+def hands_from_records(records):
+    """Groups (kind, seat, code, cards, amount) records into HandHistory objects."""
+    hand = None
+    street = 0
+    for kind, seat, code, cards, amount in records:
+        if kind == HAND:
+            hand = HandHistory(amount, seat)
+            street = 0
+        elif hand is None:
+            continue # the file starts mid-hand
+        elif kind == SEAT:
+            hand.seats.append((code, amount))
+        elif kind == HOLE:
+            hand.hole_cards[seat] = [Card.from_index(i) for i in cards]
+        elif kind == ACTION:
+            hand.actions.append((STREETS[street], seat, ACTIONS[code], amount))
+        elif kind == BOARD:
+            street = code
+            hand.board.extend(Card.from_index(i) for i in cards)
+        elif kind == WIN:
+            hand.winnings[seat] = hand.winnings.get(seat, 0) + amount
+        elif kind == END:
+            hand.pot = amount
+            hand.showdown = bool(code)
+            yield hand
+            hand = None
+
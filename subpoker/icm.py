@@ -0,0 +1,130 @@
+import heapq
+import math
+import random
+
+# icm() is exact while the subset DP visits at most this many (subset, player) pairs
+EXACT_BUDGET = 200_000
+
+
+def _check(stacks: list, payouts: list) -> None:
+    if any(stack < 0 for stack in stacks):
+        raise ValueError("Chip stacks cannot be negative.")
+    if any(payouts[i] < payouts[i + 1] for i in range(len(payouts) - 1)):
+        raise ValueError("Payouts must be listed from first place down.")
+
+
+def exact_cost(n_players: int, n_paid: int) -> int:
+    """(subset, player) pairs icm_equity visits for n_players stacks and n_paid places."""
+    n_paid = min(n_paid, n_players)
+    return sum(math.comb(n_players, size) * (n_players - size) for size in range(n_paid))
+
+
+def icm_equity(stacks: list, payouts: list) -> list[float]:
+    """
+    Prize equity of every stack under the Malmuth-Harville model: a player
+    finishes first with probability stack / total chips, then the next
+    place is drawn the same way among the players left.
+
+    Rather than recursing over finishing orders (n! of them), the DP walks
+    the sets of players holding the top places, one place at a time: each
+    set is visited once, whatever the order its players finished in, and
+    only sets smaller than the number of paid places are ever built.
+    Players with no chips are out and get 0.
+    """
+    _check(stacks, payouts)
+    equity = [0.0] * len(stacks)
+    live = [i for i, stack in enumerate(stacks) if stack > 0]
+    chips = [stacks[i] for i in live]
+    total = sum(chips)
+    bits = [1 << i for i in range(len(live))]
+
+    level = {0: (1.0, 0)}  # players placed so far -> (probability, their chips)
+    for prize in payouts[:len(live)]:
+        following = {}
+        for placed, (p, placed_chips) in level.items():
+            scale = p / (total - placed_chips)
+            for i, bit in enumerate(bits):
+                if placed & bit:
+                    continue
+                q = scale * chips[i]
+                equity[live[i]] += q * prize
+                key = placed | bit
+                entry = following.get(key)
+                following[key] = (q, placed_chips + chips[i]) if entry is None else (entry[0] + q, entry[1])
+        level = following
+    return equity
+
+
+def icm_sampled(stacks: list, payouts: list, samples: int = 20000, seed: int | None = None) -> list[float]:
+    """
+    Monte Carlo estimate of icm_equity for fields too large to enumerate.
+
+    Ordering players by an exponential draw with rate equal to their stack
+    gives exactly the Malmuth-Harville finishing order, so each sample only
+    costs one draw per player plus picking the paid places. First place is
+    not sampled: its probability is stack / total chips.
+    """
+    _check(stacks, payouts)
+    if samples <= 0:
+        raise ValueError("The sample budget must be positive.")
+    rng = random.Random(seed)
+    live = [i for i, stack in enumerate(stacks) if stack > 0]
+    paid = payouts[:len(live)]
+    total = sum(stacks[i] for i in live)
+    equity = [0.0] * len(stacks)
+    if not paid:
+        return equity
+    for i in live:
+        equity[i] = stacks[i] / total * paid[0]
+    if len(paid) == 1:
+        return equity
+
+    expovariate = rng.expovariate
+    rates = [(i, stacks[i]) for i in live]
+    places = list(enumerate(paid))[1:]
+    counts = [0.0] * len(stacks)
+    for _ in range(samples):
+        order = heapq.nsmallest(len(paid), ((expovariate(rate), i) for i, rate in rates))
+        for place, prize in places:
+            counts[order[place][1]] += prize
+    for i in live:
+        equity[i] += counts[i] / samples
+    return equity
+
+
+def icm(stacks: list, payouts: list, samples: int = 20000, seed: int | None = None,
+        budget: int = EXACT_BUDGET) -> list[float]:
+    """icm_equity when its cost fits in budget, icm_sampled otherwise."""
+    n_live = sum(1 for stack in stacks if stack > 0)
+    if exact_cost(n_live, len(payouts)) <= budget:
+        return icm_equity(stacks, payouts)
+    return icm_sampled(stacks, payouts, samples, seed)
+
+
+def icm_batch(stack_sets: list, payouts: list, samples: int = 20000, seed: int | None = None,
+              budget: int = EXACT_BUDGET) -> list[list[float]]:
+    """
+    icm() for many stack configurations at once, e.g. every outcome of a
+    shove (fold, call and win, call and lose) for every candidate seat.
+    Equity only depends on the multiset of stacks, so configurations that
+    are permutations of each other are computed once.
+    """
+    solved = {}
+    results = []
+    for stacks in stack_sets:
+        order = sorted(range(len(stacks)), key=lambda i: -stacks[i])
+        key = tuple(stacks[i] for i in order)
+        equity = solved.get(key)
+        if equity is None:
+            equity = solved[key] = icm(list(key), payouts, samples, seed, budget)
+        result = [0.0] * len(stacks)
+        for rank, i in enumerate(order):
+            result[i] = equity[rank]
+        results.append(result)
+    return results
+
+
+def game_equity(game, payouts: list, **options) -> dict:
+    """Prize equity of each player still in a Game, keyed by player."""
+    players = game.players
+    return dict(zip(players, icm([player.chips for player in players], payouts, **options)))
@@ -0,0 +1,122 @@
+import time
+
+
+class StageTimes:
+    """Durations of one stage in power-of-two nanosecond buckets, plus exact count / total / min / max."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * 40  # bucket i holds durations below 2**i ns
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e9).bit_length(), 39)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100), in seconds."""
+        target = self.count * q / 100
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return min(2 ** i / 1e9, self.max)
+        return self.max
+
+    def histogram(self) -> list[tuple[float, int]]:
+        """(bucket upper bound in seconds, count) for every non-empty bucket."""
+        return [(2 ** i / 1e9, n) for i, n in enumerate(self.buckets) if n]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class GameStats:
+    """
+    Timings and call counts collected by a Game while game.stats is set
+    (see Game.enable_stats). Stages are "blinds", "deal", the betting rounds
+    ("preflop", "flop_bet", ...), the board deals ("flop", "turn", "river"),
+    "showdown", "agent" (each decision) and "hand" (a whole play_hand).
+    Counters are "process_action", "evaluate_hand" (every hand scored at a
+    showdown) and "evaluate_hand_recomputed" (those whose tracked strength
+    was stale, so evaluate_hand ran again).
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+
+    def time(self, stage: str, step) -> None:
+        start = time.perf_counter()
+        step()
+        self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float) -> None:
+        times = self.stages.get(stage)
+        if times is None:
+            times = self.stages[stage] = StageTimes()
+        times.add(seconds)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def histogram(self, stage: str) -> list[tuple[float, int]]:
+        return self.stages[stage].histogram()
+
+    def summary(self) -> dict:
+        return {
+            "stages": {stage: times.summary() for stage, times in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+    def reset(self) -> None:
+        self.stages.clear()
+        self.counters.clear()
+
+    def report(self) -> str:
+        lines = [f"{'stage':10} {'count':>8} {'total s':>9} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}"]
+        for stage, times in sorted(self.stages.items(), key=lambda item: -item[1].total):
+            s = times.summary()
+            lines.append(f"{stage:10} {s['count']:8} {s['total']:9.3f} {s['mean'] * 1e6:9.1f} "
+                         f"{s['p50'] * 1e6:9.1f} {s['p99'] * 1e6:9.1f}")
+        for name, n in self.counters.items():
+            lines.append(f"{name}: {n}")
+        return "\n".join(lines)
+
+
+def profile_hands(game, n_hands: int, path: str | None = None, sort: str = "cumulative"):
+    """
+    Runs game.play_hand n_hands times (fewer if the game ends) under
+    cProfile. The raw profile is dumped to path when given, for snakeviz or
+    pstats; the returned pstats.Stats can be printed with print_stats().
+    """
+    import cProfile  # profiling is rare, keep it out of `import subpoker.game`
+    import pstats
+    profiler = cProfile.Profile()
+    for _ in range(n_hands):
+        if game.game_over:
+            break
+        profiler.enable()
+        game.play_hand()
+        profiler.disable()
+    if path is not None:
+        profiler.dump_stats(path)
+    return pstats.Stats(profiler).sort_stats(sort)
@@ -0,0 +1,223 @@
+import struct
+from array import array
+
+from .events import ActionTaken, BettingSkipped, EventBus, HandStarted, ShowdownResult
+from .files import replace_file
+
+MAGIC = b"SPOS\x01\x00"  # opponent stats snapshot, format version 1
+HEADER = struct.Struct("<IIqdI")  # players, counters, hands seen, half-life (0 for none), names byte length
+
+COUNTERS = ["hands", "vpip", "pfr", "aggressive", "passive", "saw_flop", "showdowns", "showdown_wins"]
+HANDS, VPIP, PFR, AGGRESSIVE, PASSIVE, SAW_FLOP, SHOWDOWNS, SHOWDOWN_WINS = range(len(COUNTERS))
+
+
+class OpponentStats:
+    """
+    Running VPIP, PFR, aggression and showdown stats for every player seen,
+    fed by the events of one or more Games (see attach). Players are keyed
+    by name, so stats carry over from one game, or one process, to the next.
+
+    Each counter is an array of doubles with one slot per player. With a
+    half_life (in hands), counts fade by half every half_life hands: a
+    player's counters are scaled when next touched, and since they all fade
+    together the ratios need no scaling at all, so every query is O(1).
+    """
+
+    def __init__(self, half_life: float | None = None):
+        self.half_life = half_life
+        self._decay = 0.5 ** (1 / half_life) if half_life else None
+        self.tick = 0  # hands seen, the clock for the decay
+        self.slots = {}  # player name -> index into the arrays
+        self.counters = [array("d") for _ in COUNTERS]
+        self.last_tick = array("q")  # when each player's counters were last scaled
+        # The hand in progress: its players (name -> slot), who already counted
+        # for VPIP / PFR, who folded, and whether the flop was seen yet
+        self._hand = {}
+        self._vpip = set()
+        self._pfr = set()
+        self._folded = set()
+        self._flop_seen = False
+        self._handlers = {HandStarted: self._hand_started, ActionTaken: self._action,
+                          BettingSkipped: self._betting_skipped, ShowdownResult: self._showdown}
+
+    def attach(self, game) -> None:
+        """Subscribes to game's events, next to whatever sink it already has."""
+        events = game.events
+        if events is None:
+            game.set_events(self)
+            return
+        if not isinstance(events, EventBus):
+            events = EventBus(events)
+            game.set_events(events)
+        events.subscribe(self, *self._handlers)
+
+    def handle(self, event) -> None:
+        handler = self._handlers.get(type(event))
+        if handler is not None:
+            handler(event)
+
+    def _slot(self, name: str) -> int:
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.last_tick)
+            for counter in self.counters:
+                counter.append(0.0)
+            self.last_tick.append(self.tick)
+        return slot
+
+    def _add(self, slot: int, counter: int) -> None:
+        gap = self.tick - self.last_tick[slot]
+        if gap:
+            if self._decay is not None:
+                factor = self._decay ** gap
+                for values in self.counters:
+                    values[slot] *= factor
+            self.last_tick[slot] = self.tick
+        self.counters[counter][slot] += 1.0
+
+    def _hand_started(self, event: HandStarted) -> None:
+        self.tick += 1
+        self._hand = {player.name: self._slot(player.name) for player in event.players}
+        self._vpip.clear()
+        self._pfr.clear()
+        self._folded.clear()
+        self._flop_seen = False
+        for slot in self._hand.values():
+            self._add(slot, HANDS)
+
+    def _see_flop(self) -> None:
+        # Whoever had not folded by the first event after the preflop saw the flop
+        self._flop_seen = True
+        for name, slot in self._hand.items():
+            if name not in self._folded:
+                self._add(slot, SAW_FLOP)
+
+    def _action(self, event: ActionTaken) -> None:
+        name = event.player.name
+        slot = self._hand.get(name)
+        if slot is None:
+            slot = self._hand[name] = self._slot(name)
+        action = event.action
+        if event.state == "preflop":
+            if action != "fold" and action != "check" and name not in self._vpip:
+                self._vpip.add(name)
+                self._add(slot, VPIP)
+            if event.raised and name not in self._pfr:
+                self._pfr.add(name)
+                self._add(slot, PFR)
+        elif not self._flop_seen:
+            self._see_flop()
+        if event.raised:
+            self._add(slot, AGGRESSIVE)
+        elif action == "call" or action == "all-in":
+            self._add(slot, PASSIVE)
+        elif action == "fold":
+            self._folded.add(name)
+
+    def _betting_skipped(self, event: BettingSkipped) -> None:
+        if event.state != "preflop" and not self._flop_seen:
+            self._see_flop()
+
+    def _showdown(self, event: ShowdownResult) -> None:
+        if not self._flop_seen:
+            self._see_flop()
+        for player in event.scores:
+            slot = self._slot(player.name)
+            self._add(slot, SHOWDOWNS)
+            if event.winnings.get(player, 0) > 0:
+                self._add(slot, SHOWDOWN_WINS)
+
+    # Queries take a player or a name; None means nothing to go on yet
+
+    def __contains__(self, player) -> bool:
+        return getattr(player, "name", player) in self.slots
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _ratio(self, player, numerator: int, denominator: int) -> float | None:
+        slot = self.slots.get(getattr(player, "name", player))
+        if slot is None:
+            return None
+        below = self.counters[denominator][slot]
+        return self.counters[numerator][slot] / below if below else None
+
+    def count(self, player, counter: str) -> float:
+        """A raw counter (see COUNTERS), faded to the current hand when decaying."""
+        slot = self.slots.get(getattr(player, "name", player))
+        if slot is None:
+            return 0.0
+        value = self.counters[COUNTERS.index(counter)][slot]
+        if self._decay is not None:
+            value *= self._decay ** (self.tick - self.last_tick[slot])
+        return value
+
+    def hands(self, player) -> float:
+        return self.count(player, "hands")
+
+    def vpip(self, player) -> float | None:
+        """Share of hands where the player put chips in preflop without being forced to."""
+        return self._ratio(player, VPIP, HANDS)
+
+    def pfr(self, player) -> float | None:
+        """Share of hands where the player raised preflop."""
+        return self._ratio(player, PFR, HANDS)
+
+    def aggression(self, player) -> float | None:
+        """Aggression factor: raises (including raising all-ins) per call."""
+        return self._ratio(player, AGGRESSIVE, PASSIVE)
+
+    def went_to_showdown(self, player) -> float | None:
+        """Share of the flops seen that reached a showdown."""
+        return self._ratio(player, SHOWDOWNS, SAW_FLOP)
+
+    def showdown_win_rate(self, player) -> float | None:
+        """Share of showdowns where the player won chips."""
+        return self._ratio(player, SHOWDOWN_WINS, SHOWDOWNS)
+
+    def summary(self, player) -> dict:
+        return {
+            "hands": self.hands(player),
+            "vpip": self.vpip(player),
+            "pfr": self.pfr(player),
+            "aggression": self.aggression(player),
+            "went_to_showdown": self.went_to_showdown(player),
+            "showdown_win_rate": self.showdown_win_rate(player),
+        }
+
+    def save(self, path: str) -> None:
+        """Writes a snapshot, best taken between hands; load() picks up from it."""
+        names = sorted(self.slots, key=self.slots.get)
+        encoded = "\0".join(names).encode()
+
+        def write(file):
+            file.write(MAGIC)
+            file.write(HEADER.pack(len(names), len(COUNTERS), self.tick, self.half_life or 0.0, len(encoded)))
+            file.write(encoded)
+            for values in self.counters:
+                file.write(values.tobytes())
+            file.write(self.last_tick.tobytes())
+        replace_file(path, write)  # a crash mid-save leaves the previous snapshot
+
+    @classmethod
+    def load(cls, path: str) -> "OpponentStats":
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an opponent stats snapshot.")
+        start = len(MAGIC) + HEADER.size
+        n_players, n_counters, tick, half_life, names_size = HEADER.unpack_from(data, len(MAGIC))
+        if n_counters != len(COUNTERS):
+            raise ValueError(f"{path} holds {n_counters} counters, expected {len(COUNTERS)}.")
+        if len(data) != start + names_size + 8 * n_players * (n_counters + 1):
+            raise ValueError(f"{path} is truncated.")
+        stats = cls(half_life or None)
+        stats.tick = tick
+        names = data[start:start + names_size].decode().split("\0") if n_players else []
+        stats.slots = {name: slot for slot, name in enumerate(names)}
+        start += names_size
+        for values in stats.counters:
+            values.frombytes(data[start:start + 8 * n_players])
+            start += 8 * n_players
+        stats.last_tick.frombytes(data[start:start + 8 * n_players])
+        return stats
@@ -1,20 +1,47 @@
 class Player:
+    actions = ("check", "fold", "call", "raise", "all_in")
+
+    __slots__ = ("name", "chips", "_hand", "_folded", "_all_in", "bet", "id", "seat", "seats", "strength")
+
     def __init__(self, name: str, chips: int):
         self.name = name
         self.chips = chips
         self._hand = [] # For internal use
-        self.folded = False
-        self.all_in = False
+        self.strength = None # hand_evaluator.HandState, kept up to date by the Table as cards are dealt
+        self.seats = None # SeatTable this player sits at, kept in sync with folded / all_in
+        self.seat = None
+        self.id = None
+        self._folded = False
+        self._all_in = False
         self.bet = 0
-        self.actions = ["check", "fold", "call", "raise", "all_in"]
 
     @property
     def hand(self):
         return self._hand
 
+    @property
+    def folded(self) -> bool:
+        return self._folded
+
+    @folded.setter
+    def folded(self, value: bool):
+        self._folded = value
+        if self.seats is not None:
+            self.seats.mark(self)
+
+    @property
+    def all_in(self) -> bool:
+        return self._all_in
+
+    @all_in.setter
+    def all_in(self, value: bool):
+        self._all_in = value
+        if self.seats is not None:
+            self.seats.mark(self)
+
     @property
     def is_active(self):
-        return not self.folded and not self.all_in
+        return not self._folded and not self._all_in
 
     @hand.setter
     def hand(self, cards: list):
@@ -36,7 +63,8 @@ class Player:
     def fold(self):
         self.folded = True
         self.all_in = False
-        self.hand = []
+        self._hand = []
+        self.strength = None
 
     def bet_chips(self, amount: int):
         if amount < 0:
@@ -69,6 +97,7 @@ class Player:
         self.all_in = False
         self.bet = 0
         self._hand = []
+        self.strength = None
     
     def perform_action(self, action: str, current_bet: int = 0, amount: int = 0) -> None | int:
         if action not in self.actions:
@@ -0,0 +1,45 @@
+class PotLedger:
+    """
+    Chips each player has committed this hand, with a running total.
+
+    Side pots are only worked out when asked for, from the committed amounts:
+    each contribution level forms a layer that the non-folded players who
+    reached it can win. A layer nobody live reached (chips from players who
+    folded after out-betting everyone left) goes to the layer below it.
+    """
+
+    def __init__(self):
+        self.contributions = {} # player -> chips committed this hand
+        self.total = 0
+
+    def add(self, player, amount: int) -> int:
+        self.contributions[player] = self.contributions.get(player, 0) + amount
+        self.total += amount
+        return self.total
+
+    def clear(self) -> None:
+        self.contributions = {}
+        self.total = 0
+
+    def committed(self, player) -> int:
+        return self.contributions.get(player, 0)
+
+    def side_pots(self, players: list) -> list[tuple[int, list]]:
+        """(amount, eligible players) from the main pot up, eligible players in the order of players."""
+        contributions = self.contributions
+        levels = sorted(set(contributions.values()))
+        pots = []
+        below = 0
+        for level in levels:
+            layer = sum(min(amount, level) - min(amount, below) for amount in contributions.values())
+            eligible = [p for p in players if not p.folded and contributions.get(p, 0) >= level]
+            if eligible:
+                pots.append((layer, eligible))
+            elif pots:
+                amount, previous = pots[-1]
+                pots[-1] = (amount + layer, previous)
+            below = level
+        return pots
+
+    def __len__(self) -> int:
+        return len(self.contributions)
@@ -0,0 +1,144 @@
+import os
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .card import Card
+from .hand_evaluator import attach_tables, evaluate_indices, share_tables
+
+MAGIC = b"SPPF"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIQ")  # magic, format version, max opponents, samples per class, seed
+MAX_OPPONENTS = 8  # heads-up up to 9 players at the table
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "preflop_equity.bin")
+
+# Class i * 13 + j of the 13x13 grid (rank indices, 12 = ace): a pair when
+# i == j, suited when i > j, offsuit when i < j.
+_LABEL_RANKS = "23456789TJQKA"
+HAND_CLASSES = []
+for _i in range(13):
+    for _j in range(13):
+        _high, _low = max(_i, _j), min(_i, _j)
+        _suffix = "" if _i == _j else ("s" if _i > _j else "o")
+        HAND_CLASSES.append(_LABEL_RANKS[_high] + _LABEL_RANKS[_low] + _suffix)
+CLASS_INDEX = {label: i for i, label in enumerate(HAND_CLASSES)}
+
+_table = None
+
+
+def class_index(hand) -> int:
+    """Grid index of a starting hand, given as two Cards or a label like "AKs"."""
+    if isinstance(hand, str):
+        try:
+            return CLASS_INDEX[hand.replace("10", "T").upper().replace("S", "s").replace("O", "o")]
+        except KeyError:
+            raise ValueError(f"Unknown starting hand: {hand}") from None
+    first, second = hand
+    high, low = max(first.rank_index, second.rank_index), min(first.rank_index, second.rank_index)
+    if first.suit_index == second.suit_index and high != low:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def hand_class(hand) -> str:
+    """Canonical label of a starting hand, e.g. "AA", "AKs" or "T9o"."""
+    return HAND_CLASSES[class_index(hand)]
+
+
+def representative(label: str) -> list[Card]:
+    """One concrete hand of a class; preflop all its combos have the same equity."""
+    index = CLASS_INDEX[label]
+    i, j = divmod(index, 13)
+    high, low = max(i, j), min(i, j)
+    second_suit = 0 if i > j else 1
+    return [Card.from_index(high), Card.from_index(second_suit * 13 + low)]
+
+
+def _class_equities(index: int, samples: int, seed: int) -> list[float]:
+    """
+    Pot share of one hand class against 1..MAX_OPPONENTS random hands. Every
+    sampled deal is reused for each opponent count, the first n opponents
+    being the ones that play.
+    """
+    import numpy as np
+    hero = [card.index for card in representative(HAND_CLASSES[index])]
+    remaining = np.array([i for i in range(52) if i not in hero], dtype=np.int8)
+    rng = np.random.default_rng([seed, index])
+    dealt = remaining[rng.random((samples, len(remaining))).argsort(axis=1)[:, :2 * MAX_OPPONENTS + 5]]
+    board = dealt[:, 2 * MAX_OPPONENTS:]
+
+    hero_score = evaluate_indices(np.hstack([np.tile(hero, (samples, 1)), board]))
+    best = np.full(samples, 32767, dtype=np.int16)  # best opponent score so far
+    ties = np.zeros(samples, dtype=np.int16)  # opponents sharing that score with hero
+    equities = []
+    for opponent in range(MAX_OPPONENTS):
+        score = evaluate_indices(np.hstack([dealt[:, 2 * opponent:2 * opponent + 2], board]))
+        ties = np.where(score < best, 0, ties) + (score == hero_score)
+        best = np.minimum(best, score)
+        share = np.where(hero_score < best, 1.0, np.where(hero_score == best, 1.0 / (ties + 1), 0.0))
+        equities.append(float(share.mean()))
+    return equities
+
+
+def generate_table(samples: int = 100000, seed: int = 0, workers: int = 1) -> list[list[float]]:
+    """
+    Monte Carlo equity of every starting-hand class against 1 to
+    MAX_OPPONENTS random hands, all in to the river. Needs NumPy.
+    """
+    args = [(index, samples, seed) for index in range(len(HAND_CLASSES))]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_tables, initargs=(share_tables(),)) as pool:
+            return list(pool.map(_class_equities, *zip(*args)))
+    return [_class_equities(*arg) for arg in args]
+
+
+def write_table(path: str = DEFAULT_PATH, samples: int = 100000, seed: int = 0, workers: int = 1) -> None:
+    rows = generate_table(samples, seed, workers)
+    values = array("f", [equity for row in rows for equity in row])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, MAX_OPPONENTS, samples, seed))
+        file.write(values.tobytes())
+
+
+def load_table(path: str = DEFAULT_PATH) -> array:
+    """Flat float32 array, equity of class c against n opponents at c * MAX_OPPONENTS + n - 1."""
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, max_opponents, _, _ = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a preflop equity table.")
+    if version != FORMAT_VERSION or max_opponents != MAX_OPPONENTS:
+        raise ValueError(f"{path} has format version {version}, expected {FORMAT_VERSION}. "
+                         f"Regenerate it with python -m subpoker.preflop")
+    values = array("f")
+    values.frombytes(data[HEADER.size:])
+    if len(values) != len(HAND_CLASSES) * MAX_OPPONENTS:
+        raise ValueError(f"{path} is truncated.")
+    return values
+
+
+def preflop_equity(hand, n_opponents: int = 1) -> float:
+    """
+    All-in equity of a starting hand (two Cards such as Player.hand, or a
+    label like "AKs") against n_opponents random hands. The table is read
+    from disk on the first call.
+    """
+    global _table
+    if not 1 <= n_opponents <= MAX_OPPONENTS:
+        raise ValueError(f"n_opponents must be between 1 and {MAX_OPPONENTS}.")
+    if _table is None:
+        _table = load_table()
+    return _table[class_index(hand) * MAX_OPPONENTS + n_opponents - 1]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the preflop equity table.")
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    options = parser.parse_args()
+    write_table(options.path, options.samples, options.seed, options.workers)
@@ -0,0 +1,241 @@
+import random
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from .card import Card
+from .hand_evaluator import evaluate_indices
+
+RANKS = "23456789TJQKA"
+SUIT_LETTERS = {"s": "♠", "h": "♥", "d": "♦", "c": "♣"}
+
+# Every two-card combo as a pair of card indices (lower first), 1326 in all
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.intp)
+COMBO_INDEX = {(a, b): i for i, (a, b) in enumerate(combinations(range(52), 2))}
+
+# Runouts beyond this many are sampled instead of enumerated
+MAX_RUNOUTS = 2000
+
+
+def combo_index(first: Card, second: Card) -> int:
+    a, b = sorted((first.index, second.index))
+    return COMBO_INDEX[(a, b)]
+
+
+def _class_combos(high: int, low: int, kind: str) -> list[int]:
+    """Combos of two ranks (rank indices); kind is "s" (suited), "o" (offsuit) or "" (both)."""
+    combos = []
+    for first_suit in range(4):
+        for second_suit in range(4):
+            if high == low and second_suit <= first_suit:
+                continue
+            if (kind == "s" and first_suit != second_suit) or (kind == "o" and first_suit == second_suit):
+                continue
+            a, b = sorted((first_suit * 13 + high, second_suit * 13 + low))
+            combos.append(COMBO_INDEX[(a, b)])
+    return combos
+
+
+def _parse_class(text: str) -> tuple[int, int, str]:
+    """ "AKs" -> (12, 11, "s"), "QQ" -> (10, 10, "") """
+    text = text.replace("10", "T")
+    if len(text) not in (2, 3) or text[0].upper() not in RANKS or text[1].upper() not in RANKS:
+        raise ValueError(f"Invalid hand: {text}")
+    high, low = sorted((RANKS.index(text[0].upper()), RANKS.index(text[1].upper())), reverse=True)
+    kind = text[2:].lower()
+    if kind not in ("", "s", "o") or (high == low and kind):
+        raise ValueError(f"Invalid hand: {text}")
+    return high, low, kind
+
+
+def _parse_card(text: str) -> Card:
+    rank, suit = text[:-1], text[-1]
+    rank = {"T": "10", "t": "10"}.get(rank, rank.upper())
+    return Card(rank, SUIT_LETTERS.get(suit.lower(), suit))
+
+
+def _parse_combo(text: str) -> list[int] | None:
+    """Specific combos such as "AsKh" or "A♠K♥", None when text is not one."""
+    text = text.replace("10", "T")
+    if len(text) != 4 or text[1] in RANKS:
+        return None
+    first, second = _parse_card(text[:2]), _parse_card(text[2:])
+    if first is second:
+        raise ValueError(f"Invalid combo: {text}")
+    return [combo_index(first, second)]
+
+
+def _parse_token(token: str) -> list[int]:
+    combo = _parse_combo(token)
+    if combo is not None:
+        return combo
+
+    if "-" in token:
+        start, end = (_parse_class(part) for part in token.split("-"))
+        (high_a, low_a, kind), (high_b, low_b, kind_b) = sorted((start, end), reverse=True)
+        if kind != kind_b:
+            raise ValueError(f"Invalid range: {token}")
+        if high_a == low_a and high_b == low_b:  # 99-QQ
+            classes = [(rank, rank) for rank in range(high_b, high_a + 1)]
+        elif high_a == high_b:  # A9s-A5s
+            classes = [(high_a, low) for low in range(low_b, low_a + 1)]
+        elif high_a - low_a == high_b - low_b:  # 76s-54s
+            classes = [(high, high - (high_a - low_a)) for high in range(high_b, high_a + 1)]
+        else:
+            raise ValueError(f"Invalid range: {token}")
+    elif token.endswith("+"):
+        high, low, kind = _parse_class(token[:-1])
+        if high == low:  # QQ+
+            classes = [(rank, rank) for rank in range(high, 13)]
+        else:  # A9s+
+            classes = [(high, kicker) for kicker in range(low, high)]
+    else:
+        high, low, kind = _parse_class(token)
+        classes = [(high, low)]
+
+    return [combo for high, low in classes for combo in _class_combos(high, low, kind)]
+
+
+def parse_range(text: str) -> np.ndarray:
+    """
+    Weights (0 to 1) of the 1326 combos in a range like "QQ+, AKs, 76s-54s".
+
+    Tokens are comma separated: classes ("AKo", "AK" for suited and offsuit),
+    plus ranges ("QQ+", "A9s+"), dash ranges ("99-66", "A5s-A2s", "76s-54s")
+    and specific combos ("AsKh"). A ":weight" suffix sets a partial weight,
+    e.g. "AQo:0.5". Later tokens override earlier ones.
+    """
+    weights = np.zeros(len(COMBOS))
+    for token in text.split(","):
+        token = token.strip()
+        if not token:
+            continue
+        weight = 1.0
+        if ":" in token:
+            token, weight = token.split(":")
+            token, weight = token.strip(), float(weight)
+        weights[_parse_token(token)] = weight
+    return weights
+
+
+class RangeEquity:
+    def __init__(self, wins: np.ndarray, ties: np.ndarray, matchups: np.ndarray, runouts: int, exact: bool):
+        # Per hero combo, summed over runouts and weighted by both range weights
+        self.wins = wins
+        self.ties = ties
+        self.matchups = matchups
+        self.runouts = runouts
+        self.exact = exact
+
+    @property
+    def win(self) -> float:
+        return self.wins.sum() / self.matchups.sum()
+
+    @property
+    def tie(self) -> float:
+        return self.ties.sum() / self.matchups.sum()
+
+    @property
+    def equity(self) -> float:
+        return (self.wins.sum() + self.ties.sum() / 2) / self.matchups.sum()
+
+    def combo_equity(self) -> np.ndarray:
+        """Equity of each of the 1326 hero combos, NaN for combos never played."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.wins + self.ties / 2) / self.matchups
+
+    def __repr__(self) -> str:
+        return (f"RangeEquity(win={self.win:.4f}, tie={self.tie:.4f}, equity={self.equity:.4f}, "
+                f"runouts={self.runouts}, exact={self.exact})")
+
+
+def _showdown(hero: np.ndarray, villain: np.ndarray, board: list[int], totals: list[np.ndarray]) -> None:
+    """
+    Adds one complete board to the wins / ties / matchups totals. Every live
+    combo is scored once; villain weight better, equal and in total is then
+    read off prefix sums over the combos in score order, minus the combos
+    sharing a card with the hero combo (the card blockers).
+    """
+    on_board = np.zeros(52, dtype=bool)
+    on_board[board] = True
+    live = np.flatnonzero(~on_board[COMBOS].any(axis=1) & ((hero > 0) | (villain > 0)))
+    if not len(live):
+        return
+    cards = COMBOS[live]
+    scores = evaluate_indices(np.hstack([cards, np.tile(board, (len(live), 1))]))
+
+    order = np.argsort(scores, kind="stable")
+    sorted_scores = scores[order]
+    sorted_weight = villain[live][order]
+    by_card = np.zeros((len(live) + 1, 52))
+    rows = np.arange(1, len(live) + 1)
+    by_card[rows, cards[order, 0]] = sorted_weight
+    by_card[rows, cards[order, 1]] += sorted_weight
+    np.cumsum(by_card, axis=0, out=by_card)
+    prefix = np.concatenate([[0.0], np.cumsum(sorted_weight)])
+
+    heroes = np.flatnonzero(hero[live] > 0)
+    first, second = cards[heroes, 0], cards[heroes, 1]
+    # The villain's copy of the hero combo itself: it holds both blocked
+    # cards so it is subtracted twice below, and has to be added back once
+    own = villain[live[heroes]]
+
+    def unblocked(end):
+        return prefix[end] - by_card[end, first] - by_card[end, second]
+
+    better_end = np.searchsorted(sorted_scores, scores[heroes], side="left")
+    equal_end = np.searchsorted(sorted_scores, scores[heroes], side="right")
+    better = unblocked(better_end)  # the hero combo ties itself, so never lies before better_end
+    up_to_equal = unblocked(equal_end) + own
+    total = unblocked(len(live)) + own
+
+    weight = hero[live[heroes]]
+    wins, ties, matchups = totals
+    wins[live[heroes]] += weight * (total - up_to_equal)
+    ties[live[heroes]] += weight * (up_to_equal - better)
+    matchups[live[heroes]] += weight * total
+
+
+def range_equity(hero, villain, board: list = (), dead: list = (), max_runouts: int = MAX_RUNOUTS,
+                 seed: int | None = None) -> RangeEquity:
+    """
+    Equity of the hero range against the villain range on a (partial) board
+    such as Table.board. Ranges are strings for parse_range or 1326-weight
+    arrays. Combo pairs sharing a card are skipped and every matchup counts
+    by the product of its weights.
+
+    The remaining board cards are enumerated when there are at most
+    max_runouts runouts, otherwise max_runouts of them are sampled.
+    """
+    hero = parse_range(hero) if isinstance(hero, str) else np.asarray(hero, dtype=float)
+    villain = parse_range(villain) if isinstance(villain, str) else np.asarray(villain, dtype=float)
+    board = [card.index for card in board]
+    known = board + [card.index for card in dead]
+    if len(board) > 5:
+        raise ValueError("A board has at most 5 cards.")
+    if len(set(known)) != len(known):
+        raise ValueError("The same card appears more than once.")
+
+    # Combos holding a dead or board card can never be dealt
+    blocked = np.zeros(52, dtype=bool)
+    blocked[known] = True
+    possible = ~blocked[COMBOS].any(axis=1)
+    hero = np.where(possible, hero, 0.0)
+    villain = np.where(possible, villain, 0.0)
+
+    remaining = [i for i in range(52) if not blocked[i]]
+    missing = 5 - len(board)
+    exact = comb(len(remaining), missing) <= max_runouts
+    if exact:
+        runouts = list(combinations(remaining, missing))
+    else:
+        rng = random.Random(seed)
+        runouts = [rng.sample(remaining, missing) for _ in range(max_runouts)]
+
+    totals = [np.zeros(len(COMBOS)) for _ in range(3)]
+    for runout in runouts:
+        _showdown(hero, villain, board + list(runout), totals)
+    if not totals[2].sum():
+        raise ValueError("The ranges have no matchup without a shared card.")
+    return RangeEquity(*totals, runouts=len(runouts), exact=exact)
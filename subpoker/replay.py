@@ -0,0 +1,266 @@
+import mmap
+import os
+import struct
+import zlib
+from bisect import bisect_left, bisect_right
+
+from .card import Card
+from .files import replace_file
+from .history import (MAGIC, RECORD, HAND, SEAT, HOLE, ACTION, BOARD, WIN, END, ACTIONS, ACTION_CODES,
+                      hands_from_records)
+from .player import Player
+from .table import Table
+
+INDEX_MAGIC = b"SPHI\x02\x00"
+# Bytes of the history file the index covers, the CRC32 of those bytes, the
+# history file's size and mtime when the index was written, number of entries
+INDEX_HEADER = struct.Struct("<QIQqI")
+# offset of the HAND record, record count, round, final pot, flags, bitmask of player ids
+INDEX_ENTRY = struct.Struct("<QIIiIQ")
+
+SHOWDOWN = 1
+ALL_IN = 2
+
+
+class HandIndexEntry:
+    __slots__ = ("number", "offset", "records", "round", "pot", "flags", "players")
+
+    def __init__(self, number: int, offset: int, records: int, round: int, pot: int, flags: int, players: int):
+        self.number = number
+        self.offset = offset
+        self.records = records
+        self.round = round
+        self.pot = pot
+        self.flags = flags
+        self.players = players # bit i set when player id i was dealt in
+
+    @property
+    def showdown(self) -> bool:
+        return bool(self.flags & SHOWDOWN)
+
+    @property
+    def all_in(self) -> bool:
+        return bool(self.flags & ALL_IN)
+
+    def __repr__(self) -> str:
+        return f"HandIndexEntry(#{self.number}, round {self.round}, pot {self.pot}, showdown={self.showdown}, all_in={self.all_in})"
+
+
+class HandHistoryFile:
+    """
+    Read-only, memory-mapped view of a hand history file with a sidecar
+    index (path + ".idx") for finding hands without decoding the file.
+
+    The index is built on first open and extended when the history file has
+    grown since, so only new hands are scanned. An index that does not match
+    the history file (damaged, or written for another version of the file)
+    is rebuilt.
+    """
+
+    def __init__(self, path: str, index_path: str | None = None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if self._view[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a hand history file.")
+
+        self.entries = []
+        self._by_round = {}
+        self._by_player = {}
+        self._by_pot = None
+        try:
+            self._load_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "HandHistoryFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _load_index(self) -> None:
+        covered = self._read_index()
+        if covered is None:
+            self.entries, self._by_round, self._by_player = [], {}, {}
+            covered = len(MAGIC)
+        if covered < len(self._view):
+            new_entries, covered = self._scan(covered)
+            for fields in new_entries:
+                self._add_entry(*fields)
+            self._write_index(covered)
+
+    def _read_index(self) -> int | None:
+        """Loads the entries of a matching index, returns the bytes it covers (None to rebuild)."""
+        try:
+            with open(self.index_path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        start = len(INDEX_MAGIC) + INDEX_HEADER.size
+        if data[:len(INDEX_MAGIC)] != INDEX_MAGIC or len(data) < start:
+            return None
+        covered, checksum, size, mtime, count = INDEX_HEADER.unpack_from(data, len(INDEX_MAGIC))
+        if len(data) != start + count * INDEX_ENTRY.size or covered > len(self._view):
+            return None
+        stat = os.stat(self.path)
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+            # The file changed since: fine if hands were only appended, the covered part is unchanged
+            if zlib.crc32(self._view[:covered]) != checksum:
+                return None
+        for fields in INDEX_ENTRY.iter_unpack(data[start:]):
+            self._add_entry(*fields)
+        return covered
+
+    def _add_entry(self, offset, records, round, pot, flags, players) -> None:
+        entry = HandIndexEntry(len(self.entries), offset, records, round, pot, flags, players)
+        self.entries.append(entry)
+        self._by_round.setdefault(round, []).append(entry.number)
+        while players:
+            low = players & -players
+            self._by_player.setdefault(low.bit_length() - 1, []).append(entry.number)
+            players ^= low
+        self._by_pot = None
+
+    def _scan(self, start: int) -> tuple[list, int]:
+        """Index fields of every complete hand from byte offset start, and where the last one ends."""
+        size = RECORD.size
+        end = start + (len(self._view) - start) // size * size
+        entries = []
+        covered = start
+        hand_start = None
+        offset = start
+        for kind, seat, code, n_cards, amount, *_ in RECORD.iter_unpack(self._view[start:end]):
+            if kind == HAND:
+                hand_start, round, flags, players, stacks = offset, amount, 0, 0, {}
+            elif hand_start is None:
+                pass
+            elif kind == SEAT:
+                players |= 1 << code
+                stacks[seat] = amount
+            elif kind == ACTION:
+                stacks[seat] -= amount
+                if code == ACTION_CODES["all-in"] or (amount and stacks[seat] == 0):
+                    flags |= ALL_IN
+            elif kind == END:
+                if code:
+                    flags |= SHOWDOWN
+                records = (offset - hand_start) // size + 1
+                entries.append((hand_start, records, round, amount, flags, players))
+                covered = offset + size
+                hand_start = None
+            offset += size
+        return entries, covered
+
+    def _write_index(self, covered: int) -> None:
+        stat = os.stat(self.path)
+
+        def write(file):
+            file.write(INDEX_MAGIC)
+            file.write(INDEX_HEADER.pack(covered, zlib.crc32(self._view[:covered]), stat.st_size,
+                                         stat.st_mtime_ns, len(self.entries)))
+            for e in self.entries:
+                file.write(INDEX_ENTRY.pack(e.offset, e.records, e.round, e.pot, e.flags, e.players))
+        try:
+            replace_file(self.index_path, write)
+        except OSError:
+            pass  # e.g. a read-only archive: the index is kept in memory and rebuilt next time
+
+    def records(self, number: int):
+        """Raw records of one hand, unpacked straight from the mapped file."""
+        entry = self.entries[number]
+        view = self._view[entry.offset:entry.offset + entry.records * RECORD.size]
+        for kind, seat, code, n_cards, amount, *cards in RECORD.iter_unpack(view):
+            yield kind, seat, code, cards[:n_cards], amount
+
+    def hand(self, number: int):
+        return next(hands_from_records(self.records(number)))
+
+    def query(self, min_pot: int | None = None, max_pot: int | None = None, showdown: bool | None = None,
+              all_in: bool | None = None, player: int | None = None, round: int | None = None) -> list[HandIndexEntry]:
+        """
+        Index entries matching every given condition, in file order. player
+        is a Player.id; pots are final pot sizes. For example
+        query(min_pot=500, all_in=True) finds all-in pots over 500 chips.
+        """
+        candidates = None
+        if round is not None:
+            candidates = self._by_round.get(round, [])
+        if player is not None:
+            numbers = self._by_player.get(player, [])
+            candidates = numbers if candidates is None else sorted(set(candidates) & set(numbers))
+        if min_pot is not None or max_pot is not None:
+            if self._by_pot is None:
+                self._by_pot = sorted((e.pot, e.number) for e in self.entries)
+            low = bisect_left(self._by_pot, (min_pot, -1)) if min_pot is not None else 0
+            high = bisect_right(self._by_pot, (max_pot, len(self.entries))) if max_pot is not None else len(self._by_pot)
+            numbers = sorted(number for _, number in self._by_pot[low:high])
+            candidates = numbers if candidates is None else sorted(set(candidates) & set(numbers))
+        if candidates is None:
+            candidates = range(len(self.entries))
+
+        matches = []
+        for number in candidates:
+            entry = self.entries[number]
+            if showdown is not None and entry.showdown != showdown:
+                continue
+            if all_in is not None and entry.all_in != all_in:
+                continue
+            matches.append(entry)
+        return matches
+
+    def restore(self, number: int, actions: int | None = None) -> Table:
+        """
+        Rebuilds the Table and its Players for one hand: at its end, or
+        right after the first `actions` actions (blinds included) when given.
+        Players are named "Player <id + 1>" since the log stores ids only.
+        """
+        records = list(self.records(number))
+        players = []
+        for kind, seat, code, cards, amount in records:
+            if kind == SEAT:
+                player = Player(f"Player {code + 1}", amount)
+                player.id = code
+                players.append(player)
+        table = Table(players)
+        table.deck.reset()
+
+        applied = 0
+        for kind, seat, code, cards, amount in records:
+            if kind == HOLE:
+                players[seat].hand = [Card.from_index(i) for i in cards]
+            elif actions is not None and applied >= actions:
+                continue
+            elif kind == ACTION:
+                player = players[seat]
+                player.chips -= amount
+                player.bet += amount
+                table.add_to_pot(player, amount)
+                if ACTIONS[code] == "fold":
+                    player.folded = True
+                elif amount and player.chips == 0:
+                    player.all_in = True
+                applied += 1
+            elif kind == BOARD:
+                table.board.extend(Card.from_index(i) for i in cards)
+            elif kind == WIN and actions is None:
+                players[seat].chips += amount
+            elif kind == END and actions is None:
+                table.pot.clear()
+                for player in players:
+                    player.bet = 0
+
+        table.deck.remove([card for player in players for card in player.hand] + table.board)
+        return table
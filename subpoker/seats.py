@@ -0,0 +1,69 @@
+class SeatTable:
+    """
+    The players in seat order with their folded and all-in state mirrored
+    into bitmasks (bit i is seat i), so counting the players left and
+    finding the next one to act are a few integer operations.
+
+    Players write their state through to the table themselves (see
+    Player.folded / Player.all_in), so the masks never go stale.
+    """
+
+    def __init__(self, players: list):
+        self.players = list(players)
+        self.size = len(self.players)
+        self.full = (1 << self.size) - 1
+        self.folded = 0
+        self.all_in = 0
+        # rings[first] is the action order starting from seat first
+        self.rings = [tuple(self.players[(first + i) % self.size] for i in range(self.size))
+                      for first in range(self.size)]
+        for seat, player in enumerate(self.players):
+            player.seat = seat
+            player.seats = self
+            self.mark(player)
+
+    def detach(self) -> None:
+        for player in self.players:
+            if player.seats is self:
+                player.seats = None
+
+    def mark(self, player) -> None:
+        bit = 1 << player.seat
+        if player.folded:
+            self.folded |= bit
+        else:
+            self.folded &= ~bit
+        if player.all_in:
+            self.all_in |= bit
+        else:
+            self.all_in &= ~bit
+
+    @property
+    def in_hand(self) -> int:
+        return self.full & ~self.folded
+
+    @property
+    def active(self) -> int:
+        return self.full & ~self.folded & ~self.all_in
+
+    def in_hand_count(self) -> int:
+        return self.in_hand.bit_count()
+
+    def active_count(self) -> int:
+        return self.active.bit_count()
+
+    def players_in(self, mask: int) -> list:
+        return [player for player in self.players if mask >> player.seat & 1]
+
+    def next_seat(self, mask: int, start: int) -> int:
+        """First seat at or after start (wrapping around) whose bit is set in mask, -1 if none."""
+        start %= self.size
+        ahead = mask >> start
+        if ahead:
+            return start + (ahead & -ahead).bit_length() - 1
+        if mask:
+            return (mask & -mask).bit_length() - 1
+        return -1
+
+    def ring(self, first: int) -> tuple:
+        return self.rings[first % self.size]
@@ -0,0 +1,251 @@
+import asyncio
+import itertools
+import json
+from abc import ABC, abstractmethod
+
+from .card import Card
+from .events import ForcedFold
+from .game import Game
+
+
+class Seat(ABC):
+    """
+    Where one player's decisions come from when a table is served. decide()
+    is awaited with the same observation and valid actions an Agent gets,
+    and returns an action string or an (action, raise_to) tuple.
+    """
+
+    @abstractmethod
+    async def decide(self, observation: dict, valid_actions: list):
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class LocalSeat(Seat):
+    """A bot (any Agent) playing in the server process."""
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    async def decide(self, observation: dict, valid_actions: list):
+        return self.agent.act(observation, valid_actions)
+
+
+class FoldSeat(Seat):
+    """Folds every decision, e.g. a seat whose client has not connected or has left."""
+
+    async def decide(self, observation: dict, valid_actions: list):
+        return "fold"
+
+
+def encode_observation(observation: dict) -> dict:
+    encoded = dict(observation)
+    encoded["hand"] = [str(card) for card in observation["hand"]]
+    encoded["board"] = [str(card) for card in observation["board"]]
+    return encoded
+
+
+def decode_observation(observation: dict) -> dict:
+    decoded = dict(observation)
+    decoded["hand"] = [Card(card[:-1], card[-1]) for card in observation["hand"]]
+    decoded["board"] = [Card(card[:-1], card[-1]) for card in observation["board"]]
+    return decoded
+
+
+class RemoteSeat(Seat):
+    """
+    A client connected over a socket, speaking one JSON object per line:
+    the server sends {"type": "act", "id", "observation", "valid_actions"},
+    the client answers {"id", "action", "raise_to"}. Answers to a request
+    that already timed out are dropped. A reply that is not valid JSON or
+    lacks an action, like a dropped connection, disconnects the seat.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.connected = True
+        self._ids = itertools.count()
+
+    async def send(self, message: dict) -> None:
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+
+    async def decide(self, observation: dict, valid_actions: list):
+        if not self.connected:
+            return "fold"
+        request_id = next(self._ids)
+        try:
+            await self.send({"type": "act", "id": request_id, "observation": encode_observation(observation),
+                             "valid_actions": valid_actions})
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                if reply.get("id") == request_id:
+                    action, raise_to = reply["action"], reply.get("raise_to")
+                    if not isinstance(action, str) or not (raise_to is None or isinstance(raise_to, int)):
+                        raise TypeError("Malformed reply.")
+                    return action, raise_to
+        except (ValueError, KeyError, TypeError, AttributeError, ConnectionError):
+            pass  # malformed reply (a non-object has no .get) or a lost connection
+        self.close()
+        return "fold"
+
+    def close(self) -> None:
+        self.connected = False
+        try:
+            self.writer.close()
+        except ConnectionError:
+            pass
+
+
+class ServedTable:
+    """
+    Drives one Game with awaitable decisions. A decision that takes longer
+    than decision_timeout seconds folds the player, so a slow seat only
+    holds up its own table.
+    """
+
+    def __init__(self, table_id: int, game: Game, seats: list, decision_timeout: float = 30.0):
+        self.table_id = table_id
+        self.game = game
+        self.seats = dict(zip(game.players, seats))
+        self.decision_timeout = decision_timeout
+        self.hands_played = 0
+        self.timeouts = 0
+
+    async def take_action(self, player) -> None:
+        game = self.game
+        to_call = game.current_bet - player.bet
+        valid_actions = game.valid_actions(player, to_call)
+        seat = self.seats[player]
+
+        for _ in range(game.max_attempts):
+            try:
+                decision = await asyncio.wait_for(seat.decide(game.observation(player, to_call), valid_actions),
+                                                  self.decision_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                if game.events is not None:
+                    game.events.handle(ForcedFold(player, "ran out of time"))
+                break
+            if game.apply_decision(player, decision, to_call, valid_actions):
+                return
+        else:
+            if game.events is not None:
+                game.events.handle(ForcedFold(player, "did not choose a valid action"))
+        game.process_action(player, "fold")
+
+    async def play_hand(self) -> None:
+        """Game.play_hand, awaiting each decision."""
+        game = self.game
+        game.start_round()
+        for state, deal in game.stages():
+            game.state = state
+            if deal is None:
+                for player in game.betting_turns():
+                    await self.take_action(player)
+            else:
+                deal()
+            if game.handle_early_hand_end():
+                break
+        else:
+            game.showdown()
+        game.remove_busted_players()
+        self.hands_played += 1
+
+    async def run(self, n_hands: int | None = None) -> None:
+        """Plays until one player is left, or n_hands hands."""
+        while not self.game.game_over and (n_hands is None or self.hands_played < n_hands):
+            await self.play_hand()
+            await asyncio.sleep(0)  # let other tables run between hands even when every seat is a bot
+
+
+class TableServer:
+    """
+    Hosts many tables in one event loop. Seats are LocalSeat bots, FoldSeat
+    placeholders or RemoteSeat clients: a client connects to serve()'s port
+    and sends {"table": table_id, "seat": seat} to take over that seat.
+    """
+
+    def __init__(self, decision_timeout: float = 30.0):
+        self.decision_timeout = decision_timeout
+        self.tables = {}
+        self._server = None
+
+    def add_table(self, players: list, small_blind: int, seats: list | None = None, **game_options) -> ServedTable:
+        """Creates a table; seats default to FoldSeat until a client joins."""
+        if seats is None:
+            seats = [FoldSeat() for _ in players]
+        game_options.setdefault("verbose", False)
+        game = Game(players, small_blind, agents=[None] * len(players), **game_options)
+        table = ServedTable(len(self.tables), game, seats, self.decision_timeout)
+        self.tables[table.table_id] = table
+        return table
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0):
+        """Starts accepting clients, returns the asyncio server (port 0 picks a free port)."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            hello = json.loads(await reader.readline())
+            table = self.tables[hello["table"]]
+            player = table.game.table.seats.players[hello["seat"]]
+        except (ValueError, KeyError, IndexError, TypeError):
+            writer.write(json.dumps({"type": "error", "message": "Unknown table or seat."}).encode() + b"\n")
+            writer.close()
+            return
+        seat = RemoteSeat(reader, writer)
+        table.seats[player].close()
+        table.seats[player] = seat
+        await seat.send({"type": "joined", "table": table.table_id, "seat": player.seat, "name": player.name})
+
+    async def run(self, n_hands: int | None = None) -> None:
+        """Plays every table concurrently."""
+        await asyncio.gather(*(table.run(n_hands) for table in self.tables.values()))
+
+    async def close(self) -> None:
+        for table in self.tables.values():
+            for seat in table.seats.values():
+                seat.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+async def run_client(agent, table_id: int, seat: int, host: str = "127.0.0.1", port: int = 0) -> int:
+    """
+    Local stand-in for a remote player: joins a seat and answers with the
+    given Agent until the server closes the connection. Returns the number
+    of decisions made.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({"table": table_id, "seat": seat}).encode() + b"\n")
+    await writer.drain()
+    decisions = 0
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = json.loads(line)
+        if message["type"] == "error":
+            raise ValueError(message["message"])
+        if message["type"] != "act":
+            continue
+        decision = agent.act(decode_observation(message["observation"]), message["valid_actions"])
+        action, raise_to = decision if isinstance(decision, tuple) else (decision, None)
+        writer.write(json.dumps({"id": message["id"], "action": action, "raise_to": raise_to}).encode() + b"\n")
+        await writer.drain()
+        decisions += 1
+    writer.close()
+    return decisions
@@ -0,0 +1,52 @@
+import random
+import time
+
+from .game import Game
+from .player import Player
+
+
+class SimulationResult:
+    def __init__(self, hands: int, elapsed: float, net: dict):
+        self.hands = hands
+        self.elapsed = elapsed
+        self.net = net  # player name -> chips won (negative when lost)
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def __repr__(self) -> str:
+        return f"SimulationResult({self.hands} hands in {self.elapsed:.2f}s, {self.hands_per_second:.0f} hands/s, net={self.net})"
+
+
+def simulate(n_hands: int, agents: list, seed=None, starting_chips: int = 1000, small_blind: int = 5) -> SimulationResult:
+    """
+    Plays n_hands headless hands between the given agents, one seat each.
+
+    Every hand starts from starting_chips so the lineup never changes; the
+    result holds each seat's net chips and the throughput. With a seed the
+    deck and every agent are seeded, so runs are reproducible.
+    """
+    rng = random.Random(seed)
+    players = [Player(f"Player {i + 1}", starting_chips) for i in range(len(agents))]
+    if seed is not None:
+        for i, agent in enumerate(agents):
+            agent.seed(f"{seed}:{i}")
+    game = Game(players, small_blind, agents=agents, verbose=False, rng=rng)
+    net = {player.name: 0 for player in players}
+
+    start = time.perf_counter()
+    for _ in range(n_hands):
+        for player in players:
+            player.chips = starting_chips
+        if len(game.players) != len(players):
+            game.set_players(list(players))
+        game.game_over = False
+
+        game.play_hand()
+
+        for player in players:
+            net[player.name] += player.chips - starting_chips
+    elapsed = time.perf_counter() - start
+
+    return SimulationResult(n_hands, elapsed, net)
@@ -0,0 +1,99 @@
+from .hand_evaluator import HandState
+
+
+class GameSnapshot:
+    """
+    Everything needed to put a Game back where it was: the game's own
+    fields, each seated player's chips / bet / flags / hand, the board, the
+    pot contributions and the deck order with its cursor.
+
+    Cards are interned and hands are replaced rather than mutated, so card
+    lists are shared instead of copied; nothing is deep copied.
+    """
+
+    __slots__ = ("players", "player_states", "dealer_position", "round", "state", "game_over",
+                 "current_bet", "current_sb", "current_bb", "board", "contributions", "pot_total", "deck")
+
+    def __init__(self, game):
+        table = game.table
+        self.players = list(game.players)
+        self.player_states = [(p.chips, p.bet, p.folded, p.all_in, p.hand) for p in self.players]
+        self.dealer_position = game.dealer_position
+        self.round = game.round
+        self.state = game.state
+        self.game_over = game.game_over
+        self.current_bet = getattr(game, "current_bet", 0)
+        self.current_sb = getattr(game, "current_sb", None)
+        self.current_bb = getattr(game, "current_bb", None)
+        self.board = tuple(table.board)
+        self.contributions = dict(table.pot.contributions)
+        self.pot_total = table.pot.total
+        self.deck = table.deck.snapshot()
+
+    def restore(self, game) -> None:
+        table = game.table
+        if game.players != self.players:
+            game.set_players(list(self.players))
+        for player, (chips, bet, folded, all_in, hand) in zip(self.players, self.player_states):
+            player.chips = chips
+            player.bet = bet
+            player.folded = folded
+            player.all_in = all_in
+            player._hand = hand
+        game.dealer_position = self.dealer_position
+        game.round = self.round
+        game.state = self.state
+        game.game_over = self.game_over
+        game.current_bet = self.current_bet
+        game.current_sb = self.current_sb
+        game.current_bb = self.current_bb
+        table.board = list(self.board)
+        _rebuild_strengths(self.players, table.board)
+        table.pot.contributions = dict(self.contributions)
+        table.pot.total = self.pot_total
+        table.deck.restore(self.deck)
+
+
+# Undo log entries, each holding what one step overwrote
+ACTION, DEAL, PAYOUT = range(3)
+
+
+def undo(game, entry: tuple) -> None:
+    """Reverts one undo log entry (see Game.checkpoint)."""
+    kind = entry[0]
+    pot = game.table.pot
+    if kind == ACTION:
+        _, player, chips, bet, folded, all_in, hand, current_bet, state, committed, total = entry
+        player.chips = chips
+        player.bet = bet
+        player.folded = folded
+        player.all_in = all_in
+        if player._hand is not hand: # undoing a fold
+            player._hand = hand
+            player.strength = HandState(hand + game.table.board)
+        game.current_bet = current_bet
+        game.state = state
+        if committed is None:
+            pot.contributions.pop(player, None)
+        else:
+            pot.contributions[player] = committed
+        pot.total = total
+    elif kind == DEAL:
+        _, state, board_size, cursor, mask = entry
+        game.state = state
+        del game.table.board[board_size:]
+        game.table.deck.rewind(cursor, mask)
+        _rebuild_strengths(game.players, game.table.board)
+    elif kind == PAYOUT:
+        _, state, chips, contributions, total = entry
+        game.state = state
+        for player, amount in chips:
+            player.chips = amount
+        pot.contributions = contributions
+        pot.total = total
+
+
+def _rebuild_strengths(players: list, board: list) -> None:
+    # HandState only moves forward, so going back rebuilds it from the cards
+    for player in players:
+        player.strength = HandState(player.hand + board) if player.hand else None
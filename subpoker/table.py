@@ -1,53 +1,65 @@
 from .deck import Deck
+from .events import ConsoleSink, PlayerEliminated, active_sink
+from .hand_evaluator import HandState
+from .pot import PotLedger
+from .seats import SeatTable
 
 class Table():
-    def __init__(self, players: list):
+    def __init__(self, players: list, rng=None, events=None):
         self.players = players
-        self.deck = Deck().shuffle()
+        self.seats = SeatTable(players)
+        self.deck = Deck(rng=rng).shuffle()
         self.board = []
-        self.pots = []  # List of dicts: {"amount": int, "players": set}
+        self.pot = PotLedger()
+        if events is None:
+            events = ConsoleSink()
+        self.events = active_sink(events) # a NullSink drops the events
     
     def reset(self) -> None:
         self.deck.reset().shuffle()
         self.board = []
-        self.pots = []
+        self.pot.clear()
         for player in self.players:
             player.reset()
         
+    def set_players(self, players: list) -> None:
+        self.seats.detach()
+        self.players = players
+        self.seats = SeatTable(players)
+
     def remove_busted_players(self):
         busted = [player for player in self.players if player.chips == 0]
-        for player in busted:
-            print(f"{player.name} is out of chips and has been eliminated.")
-        self.players = [player for player in self.players if player.chips > 0]
+        if self.events is not None:
+            for player in busted:
+                self.events.handle(PlayerEliminated(player))
+        self.set_players([player for player in self.players if player.chips > 0])
 
     def deal_private(self) -> None:
         for player in self.players:
             player.hand = self.deck.deal(2)
+            player.strength = HandState(player.hand)
 
     def deal_board(self, num:int) -> list:
         self.deck.deal(1) # Burn card
-        self.board.extend(self.deck.deal(num))
+        cards = self.deck.deal(num)
+        self.board.extend(cards)
+        for player in self.players:
+            if player.strength is not None: # folding clears it
+                player.strength.add(cards)
         return self.board
 
-    def add_to_pot(self, amount: int, eligible_players=None)  -> int:
-        if eligible_players is None: 
-            eligible_players = set(self.players)
-        
-        if self.pots and self.pots[-1]["players"] == eligible_players:
-            self.pots[-1]["amount"] += amount
-        else:
-            self.pots.append({"amount": amount, "players": eligible_players.copy()})
-        return self.total_pot()
+    def add_to_pot(self, player, amount: int) -> int:
+        return self.pot.add(player, amount)
 
-    def create_side_pot(self, amount: int, eligible_players: list) -> None:
-        self.pots.append({"amount": amount, "players": set(eligible_players)})
+    def side_pots(self) -> list[tuple[int, list]]:
+        return self.pot.side_pots(self.players)
 
     def total_pot(self) -> int:
-        return sum(pot["amount"] for pot in self.pots)
+        return self.pot.total
     
 
     def __str__(self) -> str:
-        pots_info = " | ".join(f"Pot: {pot['amount']} ({len(pot['players'])} eligible)" for pot in self.pots)
+        pots_info = " | ".join(f"Pot: {amount} ({len(players)} eligible)" for amount, players in self.side_pots())
         return f"Table with {len(self.players)} players. | {pots_info} | Board: {self.board}"
     
     def show_board(self) -> str:
@@ -0,0 +1,212 @@
+import json
+import math
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+from .hand_evaluator import attach_tables, share_tables
+from .simulation import simulate
+
+
+class Match:
+    __slots__ = ("match_id", "lineup", "seed")
+
+    def __init__(self, match_id: int, lineup: tuple, seed: str):
+        self.match_id = match_id
+        self.lineup = lineup  # bot names in seat order
+        self.seed = seed
+
+    def __repr__(self) -> str:
+        return f"Match(#{self.match_id}, {' vs '.join(self.lineup)})"
+
+
+class BotStats:
+    """Net chips per match for one bot, each match being one sample of its EV."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.matches = 0
+        self.hands = 0
+        self.chips = 0
+        self.per_hand_sum = 0.0
+        self.per_hand_sq = 0.0
+
+    def add(self, chips: int, hands: int) -> None:
+        per_hand = chips / hands
+        self.matches += 1
+        self.hands += hands
+        self.chips += chips
+        self.per_hand_sum += per_hand
+        self.per_hand_sq += per_hand * per_hand
+
+    @property
+    def ev(self) -> float:
+        """Mean chips won per hand."""
+        return self.per_hand_sum / self.matches if self.matches else 0.0
+
+    def confidence_interval(self, z: float = 1.96) -> tuple[float, float]:
+        """Normal-approximation interval for ev over the matches played."""
+        if self.matches < 2:
+            return float("-inf"), float("inf")
+        mean = self.ev
+        variance = max((self.per_hand_sq - self.matches * mean * mean) / (self.matches - 1), 0.0)
+        half = z * math.sqrt(variance / self.matches)
+        return mean - half, mean + half
+
+    def __repr__(self) -> str:
+        low, high = self.confidence_interval()
+        return f"BotStats({self.name}, {self.matches} matches, ev={self.ev:+.3f} chips/hand [{low:+.3f}, {high:+.3f}])"
+
+
+def _play_match(bots: dict, match_id: int, lineup: tuple, seed: str, n_hands: int, starting_chips: int,
+                small_blind: int) -> dict:
+    """Runs one match, returning its record or {"match", "error"} when it raised."""
+    try:
+        agents = [bots[name]() for name in lineup]
+        result = simulate(n_hands, agents, seed=seed, starting_chips=starting_chips, small_blind=small_blind)
+        net = {}
+        for name, chips in zip(lineup, result.net.values()):  # result.net is in seat order
+            net[name] = net.get(name, 0) + chips
+        record = {"match": match_id, "lineup": list(lineup), "seed": seed, "hands": n_hands,
+                  "net": net, "elapsed": result.elapsed}
+    except Exception:
+        record = {"match": match_id, "error": traceback.format_exc()}
+    return record
+
+
+class Tournament:
+    """
+    Round robin between bots: every group of table_size bots plays
+    `repeats` matches of n_hands hands, the seats rotating from one repeat
+    to the next. bots maps a name to a picklable factory returning a fresh
+    Agent (a class such as RandomAgent, or a functools.partial).
+
+    Every match has its own seed derived from the tournament seed and the
+    match number, so results do not depend on which worker plays it or in
+    what order. With a checkpoint path, finished matches are appended to it
+    as JSON lines and a rerun with the same settings skips them.
+    """
+
+    def __init__(self, bots: dict, table_size: int = 2, n_hands: int = 1000, repeats: int = 1, seed: int = 0,
+                 starting_chips: int = 1000, small_blind: int = 5, checkpoint: str | None = None):
+        if table_size < 2 or table_size > len(bots):
+            raise ValueError("table_size must be between 2 and the number of bots.")
+        self.bots = bots
+        self.table_size = table_size
+        self.n_hands = n_hands
+        self.repeats = repeats
+        self.seed = seed
+        self.starting_chips = starting_chips
+        self.small_blind = small_blind
+        self.checkpoint = checkpoint
+        self.stats = {name: BotStats(name) for name in bots}
+        self.records = {}  # match id -> finished match record
+        self.errors = {}  # match id -> traceback of a failed match
+
+    def settings(self) -> dict:
+        return {"bots": sorted(self.bots), "table_size": self.table_size, "n_hands": self.n_hands,
+                "repeats": self.repeats, "seed": self.seed, "starting_chips": self.starting_chips,
+                "small_blind": self.small_blind}
+
+    def matches(self) -> list[Match]:
+        matches = []
+        for group in combinations(sorted(self.bots), self.table_size):
+            for repeat in range(self.repeats):
+                shift = repeat % self.table_size
+                lineup = group[shift:] + group[:shift]
+                match_id = len(matches)
+                matches.append(Match(match_id, lineup, f"{self.seed}:{match_id}"))
+        return matches
+
+    def _resume(self) -> None:
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint, "rb") as file:
+            lines = file.read().split(b"\n")
+        try:
+            settings = json.loads(lines[0])
+        except ValueError:
+            settings = None  # torn before the settings line was complete, start over
+        if settings is None:
+            good = 0
+        elif settings != {"settings": self.settings()}:
+            raise ValueError(f"{self.checkpoint} was written by a tournament with other settings.")
+        else:
+            good = len(lines[0]) + 1
+            for line in lines[1:]:
+                try:
+                    record = json.loads(line)
+                    self._check_record(record)
+                except (ValueError, KeyError, TypeError):
+                    break  # a line torn by the crash, its match and the ones after it get replayed
+                self._add(record)
+                good += len(line) + 1
+        if good < os.path.getsize(self.checkpoint):
+            os.truncate(self.checkpoint, good)
+
+    def _check_record(self, record: dict) -> None:
+        if not isinstance(record["match"], int) or not isinstance(record["hands"], int):
+            raise TypeError("Malformed match record.")
+        for name, chips in record["net"].items():
+            if name not in self.stats or not isinstance(chips, int):
+                raise TypeError("Malformed match record.")
+
+    def _add(self, record: dict) -> None:
+        if record["match"] in self.records:
+            return
+        self.records[record["match"]] = record
+        for name, chips in record["net"].items():
+            self.stats[name].add(chips, record["hands"])
+
+    def run(self, workers: int = 1, progress=None) -> dict:
+        """
+        Plays every match not already in the checkpoint and returns the
+        per-bot BotStats. progress(record) is called as each match finishes.
+        """
+        self._resume()
+        pending = [match for match in self.matches() if match.match_id not in self.records]
+        log = None
+        if self.checkpoint is not None:
+            new_file = not os.path.exists(self.checkpoint) or os.path.getsize(self.checkpoint) == 0
+            log = open(self.checkpoint, "a")
+            if new_file:
+                log.write(json.dumps({"settings": self.settings()}) + "\n")
+                log.flush()
+
+        options = (self.n_hands, self.starting_chips, self.small_blind)
+        try:
+            if workers > 1 and len(pending) > 1:
+                with ProcessPoolExecutor(max_workers=workers, initializer=attach_tables,
+                                         initargs=(share_tables(),)) as pool:
+                    futures = {pool.submit(_play_match, self.bots, match.match_id, match.lineup, match.seed,
+                                           *options): match.match_id for match in pending}
+                    for future in as_completed(futures):
+                        try:
+                            record = future.result()
+                        except Exception:
+                            # The match never ran: unpicklable bots, a worker that died, ...
+                            record = {"match": futures[future], "error": traceback.format_exc()}
+                        self._finish(record, log, progress)
+            else:
+                for match in pending:
+                    self._finish(_play_match(self.bots, match.match_id, match.lineup, match.seed, *options),
+                                 log, progress)
+        finally:
+            if log is not None:
+                log.close()
+        return self.stats
+
+    def _finish(self, record: dict, log, progress) -> None:
+        if "error" in record:
+            self.errors[record["match"]] = record["error"]
+            return
+        self._add(record)
+        if log is not None:
+            log.write(json.dumps(record) + "\n")
+            log.flush()
+        if progress is not None:
+            progress(record)
+
+    def standings(self) -> list[BotStats]:
+        return sorted(self.stats.values(), key=lambda stats: -stats.ev)